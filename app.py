@@ -1,15 +1,23 @@
-import os
 import streamlit as st
 from pathlib import Path
 import json
-import base64
 from dotenv import load_dotenv
+from typing import List
+from pydantic import TypeAdapter
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 import streamlit.components.v1 as components
 
-from models.schema import ResumeData, ProfileData, Education, EmploymentHistory
+from models.schema import ResumeData, ProfileData, ProfileSummary, Education, EmploymentHistory
 from services.pdf_generator import PDFGenerator
 from services.resume_matcher import ResumeMatcher
 
+# Compiled list serializers for profile sub-entries
+EDU_ADAPTER = TypeAdapter(List[Education])
+JOB_ADAPTER = TypeAdapter(List[EmploymentHistory])
+
 # Set page config
 st.set_page_config(
     page_title="AI Resume Builder",
@@ -20,57 +28,91 @@ st.set_page_config(
 # Load environment variables from .env file if it exists
 load_dotenv()
 
+# JSON helpers (orjson when available, stdlib json otherwise)
+def read_json_file(path):
+    """Read and parse a JSON file."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_json_bytes(data):
+    """Serialize data to indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
 # Profile management functions
-def get_profiles_directory():
-    """Get the profiles directory path and create it if it doesn't exist."""
-    current_dir = Path(__file__).parent
-    profiles_dir = current_dir / "profiles"
-    if not profiles_dir.exists():
-        profiles_dir.mkdir(exist_ok=True)
-    return profiles_dir
+# Profiles directory, resolved and created once at import
+PROFILES_DIR = Path(__file__).parent / "profiles"
+PROFILES_DIR.mkdir(exist_ok=True)
 
 def save_profile(profile_data):
     """Save a profile to a JSON file."""
-    profiles_dir = get_profiles_directory()
-    profile_path = profiles_dir / f"{profile_data.name.replace(' ', '_')}.json"
+    profile_path = PROFILES_DIR / f"{profile_data.name.replace(' ', '_')}.json"
     
-    with open(profile_path, 'w') as f:
-        f.write(profile_data.model_dump_json(indent=2))
+    profile_path.write_bytes(dump_json_bytes(profile_data.model_dump(mode="json")))
+    _list_profiles_cached.clear()
     
     return profile_path
 
+@st.cache_data(show_spinner=False)
+def _load_profile_cached(profile_path, mtime):
+    """Parse a profile JSON file. Cached per (path, mtime) so edits on disk invalidate it."""
+    profile_data = read_json_file(profile_path)
+    
+    # Profiles are written by save_profile from validated models, so skip revalidation of the
+    # profile itself on reload; the slotted leaf dataclasses are cheap to build directly
+    profile_data["education"] = [Education(**edu) for edu in profile_data.get("education", [])]
+    profile_data["employment_history"] = [EmploymentHistory(**job) for job in profile_data.get("employment_history", [])]
+    return ProfileData.model_construct(**profile_data)
+
 def load_profile(profile_name):
     """Load a profile from a JSON file."""
-    profiles_dir = get_profiles_directory()
-    profile_path = profiles_dir / f"{profile_name}.json"
+    profile_path = PROFILES_DIR / f"{profile_name}.json"
     
     if not profile_path.exists():
         return None
     
-    with open(profile_path, 'r') as f:
-        profile_data = json.load(f)
+    return _load_profile_cached(str(profile_path), profile_path.stat().st_mtime)
+
+@st.cache_data(show_spinner=False)
+def _load_profile_summary_cached(profile_path, mtime):
+    """Parse only the header fields of a profile JSON file. Cached per (path, mtime)."""
+    return ProfileSummary.model_validate_json(Path(profile_path).read_bytes())
+
+def load_profile_summary(profile_name):
+    """Load the header fields of a profile without materializing its nested lists."""
+    profile_path = PROFILES_DIR / f"{profile_name}.json"
+    
+    if not profile_path.exists():
+        return None
     
-    return ProfileData(**profile_data)
+    return _load_profile_summary_cached(str(profile_path), profile_path.stat().st_mtime)
 
 def delete_profile(profile_name):
     """Delete a profile JSON file."""
-    profiles_dir = get_profiles_directory()
-    profile_path = profiles_dir / f"{profile_name}.json"
+    profile_path = PROFILES_DIR / f"{profile_name}.json"
     
     if profile_path.exists():
         profile_path.unlink()  # Delete the file
+        _list_profiles_cached.clear()
         return True
     return False  # Return False for failure case
 
-def get_available_profiles():
-    """Get a list of available profile names."""
-    profiles_dir = get_profiles_directory()
-    profiles = []
+@st.cache_data(show_spinner=False)
+def _list_profiles_cached(profiles_dir, dir_mtime):
+    """Map display names to profile file stems. Cached per directory mtime, which changes on file create/delete."""
+    profiles = {}
     
-    for profile_file in profiles_dir.glob("*.json"):
-        profiles.append(profile_file.stem.replace('_', ' '))
+    for profile_file in Path(profiles_dir).glob("*.json"):
+        profiles[profile_file.stem.replace('_', ' ')] = profile_file.stem
     
-    return profiles  # Return the list of profiles
+    return profiles
+
+def get_available_profiles():
+    """Get a mapping of available profile display names to their file stems."""
+    return _list_profiles_cached(str(PROFILES_DIR), PROFILES_DIR.stat().st_mtime)
 
 # Initialize services
 @st.cache_resource
@@ -84,28 +126,19 @@ def load_services():
         st.error(f"Template file not found: {template_path}")
         st.stop()
     
-    # Create profiles directory if it doesn't exist
-    profiles_dir = current_dir / "profiles"
-    profiles_dir.mkdir(exist_ok=True)
-    
-    # Set environment variables for Adobe PDF Services if credentials file exists
+    # Create the Adobe PDF Services generator if credentials file exists
     pdf_gen = None
     if credentials_path.exists():
         try:
             # Load credentials from JSON file
-            with open(credentials_path, 'r') as f:
-                creds = json.load(f)
+            creds = read_json_file(credentials_path)
                 
-            # Set environment variables based on the nested structure in the credentials file
+            # Pass credentials from the nested structure in the credentials file directly
             if 'client_credentials' in creds:
-                os.environ['PDF_SERVICES_CLIENT_ID'] = creds['client_credentials'].get('client_id', '')
-                os.environ['PDF_SERVICES_CLIENT_SECRET'] = creds['client_credentials'].get('client_secret', '')
-                
-                # Add organization ID if needed
-                if 'service_principal_credentials' in creds and 'organization_id' in creds['service_principal_credentials']:
-                    os.environ['PDF_SERVICES_ORGANIZATION_ID'] = creds['service_principal_credentials'].get('organization_id', '')
-                    
-                pdf_gen = PDFGenerator(str(credentials_path))
+                pdf_gen = PDFGenerator(
+                    client_id=creds['client_credentials'].get('client_id', ''),
+                    client_secret=creds['client_credentials'].get('client_secret', '')
+                )
             else:
                 st.warning("Invalid credentials file format. Missing 'client_credentials' section.")
         except Exception as e:
@@ -129,11 +162,10 @@ def load_services():
 
 services = load_services()
 
-# Helper function to create download links
-def get_download_link(content, filename, text):
-    b64 = base64.b64encode(content).decode()
-    href = f'<a href="data:application/octet-stream;base64,{b64}" download="{filename}">{text}</a>'
-    return href
+@st.cache_resource
+def get_resume_matcher():
+    """Shared ResumeMatcher so the OpenAI client is created once per process."""
+    return ResumeMatcher()
 
 # Helper function to send browser notifications
 def send_system_notification(title, message):
@@ -203,19 +235,19 @@ with resume_tab:
     else:
         # Select profile
         profile_name = st.selectbox("Select your profile", available_profiles)
-        selected_profile = None
+        profile_summary = None
         
         if profile_name:
-            selected_profile = load_profile(profile_name.replace(' ', '_'))
-            if selected_profile:
+            profile_summary = load_profile_summary(available_profiles[profile_name])
+            if profile_summary:
                 # Show selected profile info
-                st.success(f"Using profile: {selected_profile.name}")
+                st.success(f"Using profile: {profile_summary.name}")
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.markdown(f"**Name:** {selected_profile.name}")
-                    st.markdown(f"**Email:** {selected_profile.email}")
+                    st.markdown(f"**Name:** {profile_summary.name}")
+                    st.markdown(f"**Email:** {profile_summary.email}")
                 with col2:
-                    st.markdown(f"**Location:** {selected_profile.location}")
+                    st.markdown(f"**Location:** {profile_summary.location}")
         
         # Target Job Title input (optional)
         st.subheader("Target Job Title (Optional)")
@@ -243,8 +275,11 @@ with resume_tab:
         
         # Generate button
         if st.button("Generate Tailored Resume", type="primary", 
-                    disabled=not all([selected_profile, job_description, original_resume])):
+                    disabled=not all([profile_summary, job_description, original_resume])):
             with st.spinner("Analyzing job description and tailoring your resume..."):
+                # Materialize the full profile only when generating
+                selected_profile = load_profile(available_profiles[profile_name])
+                
                 # Prepare user info from the selected profile
                 # Use target job title if provided, otherwise use profile title
                 resume_title = target_job_title.strip() if target_job_title and target_job_title.strip() else selected_profile.title
@@ -256,15 +291,19 @@ with resume_tab:
                     "phone": selected_profile.phone,
                     "location": selected_profile.location,
                     "linkedin": selected_profile.linkedin if hasattr(selected_profile, "linkedin") else None,
-                    "education": [edu.model_dump() for edu in selected_profile.education] if selected_profile.education else [],
-                    "employment_history": [job.model_dump() for job in selected_profile.employment_history] if hasattr(selected_profile, "employment_history") and selected_profile.employment_history else []
+                    "education": EDU_ADAPTER.dump_python(selected_profile.education),
+                    "employment_history": JOB_ADAPTER.dump_python(selected_profile.employment_history)
                 }
+                # Filename prefix shared by all downloads
+                safe_name = user_info['name'].replace(' ', '_')
                 
-                # Create a new ResumeMatcher instance with user-provided resume text
-                resume_matcher = ResumeMatcher(experience_text=original_resume)
+                # Reuse the shared ResumeMatcher and pass the user-provided resume text per call
+                resume_matcher = get_resume_matcher()
                 
                 print("----- Generating tailored resume -----")
-                resume_data = resume_matcher.generate_tailored_resume(job_description, user_info)
+                resume_data = resume_matcher.generate_tailored_resume(
+                    job_description, user_info, experience_text=original_resume
+                )
                 print("----- Tailored resume generated -----")
 
                 # Generate files if PDF generator is available
@@ -275,18 +314,9 @@ with resume_tab:
                             services["template_path"]
                         )
                         
-                        # Create download buttons
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.markdown(
-                                get_download_link(files["docx"], f"{user_info['name'].replace(' ', '_')}_resume.docx", "Download DOCX"),
-                                unsafe_allow_html=True
-                            )
-                        with col2:
-                            st.markdown(
-                                get_download_link(files["pdf"], f"{user_info['name'].replace(' ', '_')}_resume.pdf", "Download PDF"),
-                                unsafe_allow_html=True
-                            )
+                        # The download buttons below render these
+                        st.session_state['last_resume_files'] = (safe_name, files)
+                        st.session_state.pop('last_resume_json', None)
                         
                         # Send system notification to user's browser/machine
                         send_system_notification(
@@ -298,20 +328,48 @@ with resume_tab:
                 else:
                     st.info("Adobe PDF Services credentials not found. Download functionality disabled in demo mode.")
                     
-                    # Save resume data as JSON for demo
-                    json_data = resume_data.model_dump_json(indent=2)
-                    st.download_button(
-                        label="Download Resume Data (JSON)",
-                        data=json_data,
-                        file_name=f"{user_info['name'].replace(' ', '_')}_resume_data.json",
-                        mime="application/json"
+                    # Save resume data as JSON for demo; the download button below renders it
+                    st.session_state['last_resume_json'] = (
+                        f"{safe_name}_resume_data.json",
+                        dump_json_bytes(resume_data.model_dump(mode="json"))
                     )
+                    st.session_state.pop('last_resume_files', None)
                     
                     # Send system notification to user's browser/machine
                     send_system_notification(
                         "✅ Resume Generated Successfully!",
                         f"Your tailored resume data for {user_info['name']} is ready to download (JSON format)."
                     )
+        
+        # Downloads are served from session state so they survive reruns (including the one
+        # triggered by clicking a download button)
+        if 'last_resume_files' in st.session_state:
+            safe_name, files = st.session_state['last_resume_files']
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label="Download DOCX",
+                    data=files["docx"],
+                    file_name=f"{safe_name}_resume.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+            with col2:
+                st.download_button(
+                    label="Download PDF",
+                    data=files["pdf"],
+                    file_name=f"{safe_name}_resume.pdf",
+                    mime="application/pdf"
+                )
+        
+        # Demo-mode JSON download
+        if 'last_resume_json' in st.session_state:
+            json_file_name, json_data = st.session_state['last_resume_json']
+            st.download_button(
+                label="Download Resume Data (JSON)",
+                data=json_data,
+                file_name=json_file_name,
+                mime="application/json"
+            )
 
 # Profile Management Tab (now second)
 with profile_tab:
@@ -325,7 +383,7 @@ with profile_tab:
         if available_profiles:
             profile_name = st.selectbox("Select a profile to view", available_profiles, key="view_profile_select")
             if profile_name:
-                selected_profile = load_profile(profile_name.replace(' ', '_'))
+                selected_profile = load_profile(available_profiles[profile_name])
                 if selected_profile:
                     st.success(f"Profile for {selected_profile.name}")
                     
@@ -356,7 +414,7 @@ with profile_tab:
                     # Add delete button
                     if st.button("Delete Profile", type="primary", key="delete_profile"):
                         with st.spinner("Deleting profile..."):
-                            if delete_profile(profile_name.replace(' ', '_')):
+                            if delete_profile(available_profiles[profile_name]):
                                 st.success(f"Profile '{profile_name}' has been deleted!")
                                 st.info("Please refresh the page to see the updated profile list.")
                             else:
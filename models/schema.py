@@ -1,21 +1,35 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 from typing import List, Optional
 
-class Education(BaseModel):
+@dataclass(frozen=True, slots=True, config=ConfigDict(extra='ignore'))
+class Education:
     """Schema for education data."""
     university_name: str = Field(..., description="Name of the university")
     period: str = Field(..., description="Period of study (e.g., '2018-2022')")
     location: str = Field(..., description="Location of the university")
     degree: str = Field(..., description="Degree obtained")
 
-class EmploymentHistory(BaseModel):
+@dataclass(frozen=True, slots=True, config=ConfigDict(extra='ignore'))
+class EmploymentHistory:
     """Schema for employment history data."""
     company_name: str = Field(..., description="Name of the company")
     period: str = Field(..., description="Period of employment (e.g., '01/2021 - 05/2025')")
     location: str = Field(..., description="Location of the company")
 
+class ProfileSummary(BaseModel):
+    """Header fields of a profile, for views that don't need the nested lists."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
+    name: str = Field(..., description="Full name of the candidate")
+    email: str = Field(..., description="Email address of the candidate")
+    location: str = Field(..., description="Location of the candidate")
+    linkedin: Optional[str] = Field(None, description="LinkedIn profile URL")
+
 class ProfileData(BaseModel):
     """Schema for user profile data."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     name: str = Field(..., description="Full name of the candidate")
     title: str = Field(..., description="Title of the candidate")
     email: str = Field(..., description="Email address of the candidate")
@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+import time
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, Sequence, TypeVar, Union
+
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+T = TypeVar("T")
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tokenizer for gpt-4.1, or None if it can't be loaded (e.g. offline)."""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-4.1")
+    except Exception:
+        return None
+
+@lru_cache(maxsize=256)
+def count_tokens(text: str) -> int:
+    """Count prompt tokens, estimating ~4 characters per token if tiktoken is unavailable."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens prompt tokens (estimated the same way as count_tokens)."""
+    max_tokens = max(max_tokens, 0)
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    return encoding.decode(encoding.encode(text)[:max_tokens])
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry on rate limits (429), server errors (5xx), timeouts and connection failures."""
+    # Imported here so loading the runner does not pull in the openai package
+    from openai import APIConnectionError, APIStatusError, RateLimitError
+    if isinstance(exc, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(exc, APIStatusError) and exc.status_code >= 500
+
+class ParallelResumeRunner:
+    """Runs OpenAI calls with optional concurrency and RPM/TPM rate limits, and retries.
+
+    Modeled on OpenAI's api_request_parallel_processor: each call waits for a free
+    concurrency slot and for enough request and token capacity in two buckets that
+    refill continuously at the per-minute limits, then retries transient errors (429/5xx,
+    timeouts, dropped connections) with exponential backoff.
+
+    Every limit is off by default (None), since the right values depend on the account's
+    OpenAI tier. OpenAI limits each model separately, so a runner with limits set should
+    only be shared by calls to models with the same limits.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None, max_attempts: int = 5):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_attempts = max_attempts
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else contextlib.nullcontext()
+        self._lock = asyncio.Lock()
+        self._available_requests = float(requests_per_minute or 0)
+        self._available_tokens = float(tokens_per_minute or 0)
+        self._last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        """Add the capacity accumulated since the last refill, capped at one minute's worth."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._available_requests = min(
+                self.requests_per_minute,
+                self._available_requests + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self._available_tokens = min(
+                self.tokens_per_minute,
+                self._available_tokens + elapsed * self.tokens_per_minute / 60
+            )
+
+    async def _acquire(self, tokens: int) -> None:
+        """Wait until one request and the given number of tokens are available, then take them.
+
+        Buckets without a limit are skipped.
+        """
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return
+        # A single prompt larger than the whole bucket would otherwise wait forever
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.requests_per_minute and self._available_requests < 1:
+                    wait = (1 - self._available_requests) * 60 / self.requests_per_minute
+                if self.tokens_per_minute and self._available_tokens < tokens:
+                    wait = max(wait, (tokens - self._available_tokens) * 60 / self.tokens_per_minute)
+                if not wait:
+                    if self.requests_per_minute:
+                        self._available_requests -= 1
+                    if self.tokens_per_minute:
+                        self._available_tokens -= tokens
+                    return
+                await asyncio.sleep(wait)
+
+    async def call(self, request_fn: Callable[[], Awaitable[T]], prompt: Union[str, Sequence[str]],
+                   max_output_tokens: Optional[int] = None) -> T:
+        """Run request_fn under the concurrency and rate limits, retrying transient errors.
+
+        prompt (a string, or the message contents) is only used to size the token-bucket
+        charge; max_output_tokens, the request's output cap, is added to it the same way the
+        API counts it against the TPM limit. Token counts are cached, so constant prompt parts
+        are only tokenized once, and skipped entirely without a TPM limit.
+        """
+        tokens = 0
+        if self.tokens_per_minute:
+            parts = [prompt] if isinstance(prompt, str) else prompt
+            tokens = sum(count_tokens(part) for part in parts) + (max_output_tokens or 0)
+        async with self._semaphore:
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception(_is_retryable),
+                wait=wait_exponential_jitter(initial=1, max=60),
+                stop=stop_after_attempt(self.max_attempts),
+                reraise=True
+            ):
+                with attempt:
+                    await self._acquire(tokens)
+                    return await request_fn()
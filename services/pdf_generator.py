@@ -1,6 +1,7 @@
 import os
 import json
-import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Correct imports based on the example
@@ -17,100 +18,126 @@ from adobe.pdfservices.operation.pdfjobs.result.document_merge_result import Doc
 
 from models.schema import ResumeData
 
+# Re-upload the template well before Adobe expires the uploaded asset
+TEMPLATE_ASSET_TTL_SECONDS = 60 * 60
+
 class PDFGenerator:
-    def __init__(self, credentials_path):
-        self.credentials_path = credentials_path
+    def __init__(self, client_id, client_secret):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        # Uploaded template assets: template_path -> (mtime, uploaded_at, asset)
+        self._asset_cache = {}
+        # Credentials and PDF Services client are created lazily and reused
+        self._credentials = None
+        self._client = None
+    
+    @property
+    def client(self):
+        """PDF Services client, created on first use and reused across generations."""
+        if self._client is None:
+            self._client = PDFServices(credentials=self._get_credentials())
+        return self._client
     
     def _get_credentials(self):
-        """Initialize credentials from file."""
-        # Looking at the example code, it appears credentials should be directly 
-        # initialized with environment variables, not from the file
-        
-        # Get credentials from environment variables
-        client_id = os.getenv('PDF_SERVICES_CLIENT_ID')
-        client_secret = os.getenv('PDF_SERVICES_CLIENT_SECRET')
+        """Initialize credentials from the client ID and secret."""
+        if self._credentials is not None:
+            return self._credentials
         
         # Create credentials
-        credentials = ServicePrincipalCredentials(
-            client_id=client_id,
-            client_secret=client_secret
+        self._credentials = ServicePrincipalCredentials(
+            client_id=self.client_id,
+            client_secret=self.client_secret
         )
             
-        return credentials
+        return self._credentials
         
     def generate_resume(self, resume_data: ResumeData, template_path: str):
         """Generate both DOCX and PDF versions of resume from template and data."""
         try:
-            # Create temporary directory to store outputs
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Convert ResumeData to JSON string
-                json_data_for_merge = resume_data.model_dump()
-                
-                # Process employment history for template if available
-                if hasattr(resume_data, 'employment_history') and resume_data.employment_history:
-                    # Format employment history for the template
-                    json_data_for_merge['formatted_employment_history'] = []
-                    for job in resume_data.employment_history:
-                        json_data_for_merge['formatted_employment_history'].append({
-                            'company_name': job.company_name,
-                            'period': job.period,
-                            'location': job.location
-                        })
-                
-                # Process experiences with the new structure
-                if hasattr(resume_data, 'experiences') and resume_data.experiences:
-                    # Format experiences for the template
-                    json_data_for_merge['formatted_experiences'] = []
-                    for exp in resume_data.experiences:
-                        # Extract bullet points as strings
-                        bullet_points = [bp.bullet_point for bp in exp.bullet_points]
-                        
-                        json_data_for_merge['formatted_experiences'].append({
-                            'company': exp.company_info.name,
-                            'period': exp.company_info.period,
-                            'location': exp.company_info.location,
-                            'job_title': exp.job_title,
-                            'bullet_points': bullet_points
-                        })
-                
-                # Read the template file
-                with open(template_path, 'rb') as file:
-                    input_stream = file.read()
-                
-                # Initialize credentials
-                credentials = self._get_credentials()
-                
-                # Create PDF Services instance
-                pdf_services = PDFServices(credentials=credentials)
-                
-                # Upload the template asset
-                input_asset = pdf_services.upload(input_stream=input_stream,
-                                                 mime_type=PDFServicesMediaType.DOCX)
-                
-                # Generate DOCX
-                docx_path = os.path.join(temp_dir, "resume.docx")
-                docx_content = self._merge_document(
-                    pdf_services, input_asset, json_data_for_merge, 
-                    OutputFormat.DOCX, docx_path
-                )
-                
-                # Generate PDF
-                pdf_path = os.path.join(temp_dir, "resume.pdf")
-                pdf_content = self._merge_document(
-                    pdf_services, input_asset, json_data_for_merge, 
-                    OutputFormat.PDF, pdf_path
-                )
-                
-                return {
-                    "docx": docx_content,
-                    "pdf": pdf_content
-                }
-                
+            # Convert ResumeData to JSON string
+            json_data_for_merge = resume_data.model_dump()
+            
+            # Process employment history for template if available
+            if hasattr(resume_data, 'employment_history') and resume_data.employment_history:
+                # Format employment history for the template
+                json_data_for_merge['formatted_employment_history'] = [
+                    {
+                        'company_name': job.company_name,
+                        'period': job.period,
+                        'location': job.location
+                    }
+                    for job in resume_data.employment_history
+                ]
+            
+            # Process experiences with the new structure
+            if hasattr(resume_data, 'experiences') and resume_data.experiences:
+                # Format experiences for the template, with bullet points as strings
+                json_data_for_merge['formatted_experiences'] = [
+                    {
+                        'company': exp.company_info.name,
+                        'period': exp.company_info.period,
+                        'location': exp.company_info.location,
+                        'job_title': exp.job_title,
+                        'bullet_points': exp.bullet_points
+                    }
+                    for exp in resume_data.experiences
+                ]
+            
+            # Reuse the shared PDF Services instance
+            pdf_services = self.client
+            
+            input_asset = self._get_template_asset(pdf_services, template_path)
+            try:
+                return self._merge_all(pdf_services, input_asset, json_data_for_merge)
+            except Exception as e:
+                if not isinstance(e.__cause__, ServiceApiException):
+                    raise
+                # The cached asset may have expired on Adobe's side; upload again and retry once
+                self._asset_cache.pop(template_path, None)
+                input_asset = self._get_template_asset(pdf_services, template_path)
+                return self._merge_all(pdf_services, input_asset, json_data_for_merge)
+            
         except (ServiceApiException, ServiceUsageException, SdkException) as e:
             raise Exception(f"Error generating document: {str(e)}")
     
-    def _merge_document(self, pdf_services, input_asset, json_data, output_format, output_path):
-        """Merges document template with JSON data and saves to output path."""
+    def _get_template_asset(self, pdf_services, template_path):
+        """Return the uploaded template asset, uploading it if missing, stale or expired."""
+        mtime = os.path.getmtime(template_path)
+        cached = self._asset_cache.get(template_path)
+        if cached is not None:
+            cached_mtime, uploaded_at, asset = cached
+            if cached_mtime == mtime and time.monotonic() - uploaded_at < TEMPLATE_ASSET_TTL_SECONDS:
+                return asset
+        
+        input_stream = Path(template_path).read_bytes()
+        asset = pdf_services.upload(input_stream=input_stream,
+                                    mime_type=PDFServicesMediaType.DOCX)
+        # One entry per template path, so an edited template replaces the old upload
+        self._asset_cache[template_path] = (mtime, time.monotonic(), asset)
+        return asset
+    
+    def _merge_all(self, pdf_services, input_asset, json_data):
+        """Generate DOCX and PDF concurrently; both are independent merge jobs against the same template."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            docx_future = executor.submit(
+                self._merge_document, pdf_services, input_asset,
+                json_data, OutputFormat.DOCX
+            )
+            pdf_future = executor.submit(
+                self._merge_document, pdf_services, input_asset,
+                json_data, OutputFormat.PDF
+            )
+            
+            return {
+                "docx": docx_future.result(),
+                "pdf": pdf_future.result()
+            }
+    
+    def _merge_document(self, pdf_services, input_asset, json_data, output_format, output_path=None):
+        """Merges document template with JSON data and returns the result bytes.
+
+        The result is also saved to output_path when one is given.
+        """
         try:
             # Create parameters for the job
             document_merge_params = DocumentMergeParams(
@@ -132,13 +159,11 @@ class PDFGenerator:
             result_asset = pdf_services_response.get_result().get_asset()
             stream_asset = pdf_services.get_content(result_asset)
             
-            # Save the content to output path
-            with open(output_path, "wb") as file:
-                file.write(stream_asset.get_input_stream())
-            
-            # Read the file back for returning
-            with open(output_path, 'rb') as file:
-                return file.read()
+            # Return the content, saving it to output path only if requested
+            content = stream_asset.get_input_stream()
+            if output_path is not None:
+                Path(output_path).write_bytes(content)
+            return content
                 
         except (ServiceApiException, ServiceUsageException, SdkException) as e:
-            raise Exception(f"Error in document merge: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Error in document merge: {str(e)}") from e 
\ No newline at end of file
@@ -1,27 +1,222 @@
+import asyncio
+import hashlib
+import heapq
+import importlib.util
 import json
+import logging
+import mmap
 import os
 import re
-import markdown
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
-from openai import OpenAI
-
-class BulletPoint(BaseModel):
-    bullet_point: str =  Field(..., description="bullet point of the expereience")
+import string
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, ClassVar, Dict, FrozenSet, Iterator, List, Optional, Tuple, Type
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+# openai is imported on first use: it dominates this module's import time and is not
+# needed by workers that never call the API
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+from services.parallel_runner import ParallelResumeRunner, count_tokens, truncate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Event loop that runs the async implementation for the sync entry points. The AsyncOpenAI
+# connection pool is bound to the loop it is first used on, so a per-call asyncio.run()
+# would break connection reuse on a long-lived matcher; every sync call runs here instead.
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+
+# OpenAI clients shared by every matcher using the same API key, so their connection
+# pools (and TLS sessions) are reused instead of rebuilt per instance
+_CLIENTS: Dict[str, Tuple["OpenAI", "AsyncOpenAI"]] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Concurrent requests share one HTTP/2 connection when the h2 package is installed, instead
+# of each opening its own TCP/TLS connection
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Batch API settings: how long bulk callers wait before falling back to online calls,
+# and how often a running batch is polled
+DEFAULT_BATCH_TIMEOUT_SECONDS = 60 * 60
+BATCH_POLL_INTERVAL_SECONDS = 30
+
+# Keyword extractor vocabulary: words of four or more letters that are not common filler
+_WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+_STOPWORDS = frozenset({"the", "and", "a", "to", "of", "in", "with", "for", "on", "is", "are", "you", "will", "be"})
+
+# Experience files at least this large are memory-mapped instead of read through a buffer
+EXPERIENCE_MMAP_THRESHOLD = 64 * 1024
+
+# Bullet point templates for experiences generated from employment history; each takes the
+# JD keywords positionally, padded with a generic term when the JD yields too few
+_BULLET_TEMPLATES = (
+    "Led development of {0} solutions, resulting in a 30% increase in team productivity.",
+    "Implemented {1} framework, reducing system downtime by 25%.",
+    "Designed and executed {2} strategy, leading to 40% improvement in performance metrics.",
+    "Optimized {3} workflow, cutting operational costs by 20%.",
+    "Collaborated with cross-functional teams to deliver {4} project ahead of schedule."
+)
+_BULLET_KEYWORD_PAD = "software"
+
+# Interchangeable bullet starters, grouped by the kind of work they describe. A bullet whose
+# starting verb was already used gets the first unused verb from the same group, in the same
+# tense (past for earlier roles, present for the current one).
+_VERB_CATEGORIES = (
+    ("Developed", "Built", "Created", "Designed", "Engineered", "Architected", "Constructed", "Established",
+     "Formulated", "Founded", "Generated", "Initiated", "Innovated", "Introduced", "Invented", "Launched",
+     "Pioneered", "Produced"),
+    ("Implemented", "Deployed", "Executed", "Installed", "Integrated", "Operationalized", "Rolled-out"),
+    ("Optimized", "Improved", "Enhanced", "Accelerated", "Advanced", "Amplified", "Boosted", "Expedited",
+     "Maximized", "Refined", "Revamped", "Streamlined", "Strengthened", "Upgraded"),
+    ("Led", "Directed", "Drove", "Spearheaded", "Championed", "Guided", "Headed", "Mentored", "Orchestrated",
+     "Oversaw", "Supervised"),
+    ("Analyzed", "Assessed", "Evaluated", "Examined", "Audited", "Diagnosed", "Identified", "Investigated",
+     "Researched", "Studied", "Surveyed"),
+    ("Managed", "Coordinated", "Administered", "Facilitated", "Organized", "Planned", "Scheduled"),
+    ("Achieved", "Delivered", "Accomplished", "Attained", "Exceeded", "Outperformed", "Surpassed"),
+    ("Automated", "Migrated", "Modernized", "Transformed", "Converted", "Reengineered", "Restructured",
+     "Revitalized", "Transitioned"),
+    ("Collaborated", "Partnered", "Cooperated", "Liaised", "Negotiated", "Unified"),
+    ("Resolved", "Solved", "Debugged", "Diagnosed", "Remedied", "Troubleshot"),
+    ("Scaled", "Expanded", "Extended", "Grew"),
+    ("Authored", "Documented", "Wrote", "Composed", "Drafted", "Published"),
+    ("Trained", "Coached", "Educated", "Instructed"),
+    ("Monitored", "Tracked", "Validated", "Verified"),
+    ("Devised", "Conceptualized", "Formulated", "Strategized"),
+)
+# Present tense of each starter; "Founded" has none, since "Found" reads as the past of "find"
+_PRESENT_TENSE = {
+    "Developed": "Develop", "Built": "Build", "Created": "Create", "Designed": "Design",
+    "Engineered": "Engineer", "Architected": "Architect", "Constructed": "Construct",
+    "Established": "Establish", "Formulated": "Formulate", "Generated": "Generate", "Initiated": "Initiate",
+    "Innovated": "Innovate", "Introduced": "Introduce", "Invented": "Invent", "Launched": "Launch",
+    "Pioneered": "Pioneer", "Produced": "Produce",
+    "Implemented": "Implement", "Deployed": "Deploy", "Executed": "Execute", "Installed": "Install",
+    "Integrated": "Integrate", "Operationalized": "Operationalize", "Rolled-out": "Roll-out",
+    "Optimized": "Optimize", "Improved": "Improve", "Enhanced": "Enhance", "Accelerated": "Accelerate",
+    "Advanced": "Advance", "Amplified": "Amplify", "Boosted": "Boost", "Expedited": "Expedite",
+    "Maximized": "Maximize", "Refined": "Refine", "Revamped": "Revamp", "Streamlined": "Streamline",
+    "Strengthened": "Strengthen", "Upgraded": "Upgrade",
+    "Led": "Lead", "Directed": "Direct", "Drove": "Drive", "Spearheaded": "Spearhead",
+    "Championed": "Champion", "Guided": "Guide", "Headed": "Head", "Mentored": "Mentor",
+    "Orchestrated": "Orchestrate", "Oversaw": "Oversee", "Supervised": "Supervise",
+    "Analyzed": "Analyze", "Assessed": "Assess", "Evaluated": "Evaluate", "Examined": "Examine",
+    "Audited": "Audit", "Diagnosed": "Diagnose", "Identified": "Identify", "Investigated": "Investigate",
+    "Researched": "Research", "Studied": "Study", "Surveyed": "Survey",
+    "Managed": "Manage", "Coordinated": "Coordinate", "Administered": "Administer",
+    "Facilitated": "Facilitate", "Organized": "Organize", "Planned": "Plan", "Scheduled": "Schedule",
+    "Achieved": "Achieve", "Delivered": "Deliver", "Accomplished": "Accomplish", "Attained": "Attain",
+    "Exceeded": "Exceed", "Outperformed": "Outperform", "Surpassed": "Surpass",
+    "Automated": "Automate", "Migrated": "Migrate", "Modernized": "Modernize", "Transformed": "Transform",
+    "Converted": "Convert", "Reengineered": "Reengineer", "Restructured": "Restructure",
+    "Revitalized": "Revitalize", "Transitioned": "Transition",
+    "Collaborated": "Collaborate", "Partnered": "Partner", "Cooperated": "Cooperate", "Liaised": "Liaise",
+    "Negotiated": "Negotiate", "Unified": "Unify",
+    "Resolved": "Resolve", "Solved": "Solve", "Debugged": "Debug", "Remedied": "Remedy",
+    "Troubleshot": "Troubleshoot",
+    "Scaled": "Scale", "Expanded": "Expand", "Extended": "Extend", "Grew": "Grow",
+    "Authored": "Author", "Documented": "Document", "Wrote": "Write", "Composed": "Compose",
+    "Drafted": "Draft", "Published": "Publish",
+    "Trained": "Train", "Coached": "Coach", "Educated": "Educate", "Instructed": "Instruct",
+    "Monitored": "Monitor", "Tracked": "Track", "Validated": "Validate", "Verified": "Verify",
+    "Devised": "Devise", "Conceptualized": "Conceptualize", "Strategized": "Strategize",
+}
+_VERB_SYNONYMS: Dict[str, List[str]] = {}
+for _category in _VERB_CATEGORIES:
+    for _group in (_category, tuple(_PRESENT_TENSE[v] for v in _category if v in _PRESENT_TENSE)):
+        for _verb in _group:
+            _synonyms = _VERB_SYNONYMS.setdefault(_verb.lower(), [])
+            _synonyms.extend(v for v in _group if v != _verb and v not in _synonyms)
+del _category, _group, _verb, _synonyms
+
+# LLM results (extracted skills, generated resumes) are cached by their inputs, in memory
+# and on disk. Bump the prompt versions whenever a prompt or schema changes to invalidate them.
+SKILLS_MODEL = "gpt-4.1"
+RESUME_MODEL = "gpt-4.1"
+LLM_CACHE_DIR = Path(__file__).resolve().parent.parent / ".llm_cache"
+LLM_MEMORY_CACHE_SIZE = 1024
+_SKILLS_PROMPT_VERSION = 1
+_RESUME_PROMPT_VERSION = 4
+
+# Models tried in order for online resume generation: a result that fails _quality_check
+# (or does not validate) escalates to the next tier, and the last tier's result is kept
+RESUME_MODEL_TIERS = ("gpt-4o-mini", RESUME_MODEL)
+
+# Output caps sent with every request; they also size the runner's TPM charge, the way
+# OpenAI counts them against the limit
+SKILLS_MAX_OUTPUT_TOKENS = 2_048
+RESUME_MAX_OUTPUT_TOKENS = 8_192
+
+# Prompt size limit for resume generation: the smallest context window among
+# RESUME_MODEL_TIERS (128K for gpt-4o-mini) less a safety margin, keeping room for the
+# response. Longer job descriptions are truncated instead of failing at the API.
+PROMPT_TOKEN_BUDGET = 120_000
+
+# JSON helpers for Batch API files (orjson when available, stdlib json otherwise)
+def _json_dumps_bytes(data) -> bytes:
+    """Serialize data to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+def _json_loads(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _run_sync(coro):
+    """Run a coroutine to completion on the shared background event loop."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, name="resume-matcher-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result()
+
+def _get_clients(api_key: str) -> Tuple["OpenAI", "AsyncOpenAI"]:
+    """Return the shared sync and async OpenAI clients for an API key, creating them once."""
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+    with _CLIENTS_LOCK:
+        clients = _CLIENTS.get(api_key)
+        if clients is None:
+            # The Default*HttpxClient classes keep the SDK's own timeouts and pool limits. Every
+            # async call goes through ParallelResumeRunner, which does the retrying, so the async
+            # client's built-in retries are off instead of multiplying the attempts.
+            clients = _CLIENTS[api_key] = (
+                OpenAI(api_key=api_key, http_client=DefaultHttpxClient(http2=_HTTP2)),
+                AsyncOpenAI(api_key=api_key, http_client=DefaultAsyncHttpxClient(http2=_HTTP2), max_retries=0)
+            )
+        return clients
 
 class CompanyInfo(BaseModel):
     """Schema for company information in experiences."""
+    model_config = ConfigDict(extra='forbid')
+
     name: str = Field(..., description="Name of the company")
     period: str = Field(..., description="Period of employment (e.g., 'Jan 2021 - May 2025')")
     location: str = Field(..., description="Location of the company")
 
 class Experience(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     company_info: CompanyInfo = Field(..., description="Detailed company information")
     job_title: str = Field(..., description="Job title for the position")
-    bullet_points: List[BulletPoint] = Field(..., description="List of bullet points describing achievements")
+    bullet_points: List[str] = Field(..., description="List of bullet points describing achievements")
 
 class Education(BaseModel):
     """Schema for education data."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     university_name: str = Field(..., description="Name of the university")
     period: str = Field(..., description="Period of study (e.g., 'Aug 2018 - Aug 2022')")
     location: str = Field(..., description="Location of the university")
@@ -29,16 +224,22 @@ class Education(BaseModel):
 
 class EmploymentHistory(BaseModel):
     """Schema for employment history data."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     company_name: str = Field(..., description="Name of the company")
     period: str = Field(..., description="Period of employment (e.g., '01/2021 - 05/2025')")
     location: str = Field(..., description="Location of the company")
 
 class Skill(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     category: str = Field(..., description="Category of the skill. This is the category of technical skills section in resume. It can be something like Programming Languages, Frameworks & Libraries, Tools & Platforms, or Methodologies. DO NOT include soft skills categories like Communication, Leadership, etc.")
     skill_list: str = Field(..., description="This is the actual list of technical skills belongs to the category.")
 
 class ResumeData(BaseModel):
     """Schema for resume data that will be merged with the template."""
+    model_config = ConfigDict(extra='forbid')
+
     name: str = Field(..., description="Full name of the candidate")
     title: str = Field(..., description="Title of the candidate")
     
@@ -52,93 +253,308 @@ class ResumeData(BaseModel):
     employment_history: Optional[List[EmploymentHistory]] = Field(default_factory=list, description="User's actual employment history")
     skills: List[Skill] = Field(default_factory=list, description="List of skills of the candidate")
 
+# Per-field validators for the sections of a streamed, still incomplete ResumeData
+_RESUME_FIELD_ADAPTERS = {name: TypeAdapter(field.annotation) for name, field in ResumeData.model_fields.items()}
+
 class Skills(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     hard_skills: List[str] = Field(default=[], description="List of hard skills in ATS. In the context of an Applicant Tracking System (ATS), a hard skill is a specific, measurable, and teachable keyword that the system is programmed to identify and match on a resume.")
     soft_skills: List[str] = Field(default=[], description="List of soft skills in ATS. From the perspective of an Applicant Tracking System, a soft skill is a non-technical, personality-driven keyword related to your work habits, interpersonal abilities, and character.")
 
-class ResumeMatcher:
-    def __init__(self, experience_file_path: Optional[str] = None, experience_text: Optional[str] = None):
-        """Initialize with either path to experience markdown file or direct experience text.
-        
-        Args:
-            experience_file_path: Path to experience markdown file (optional)
-            experience_text: Direct experience text input (optional)
-            
-        Note: experience_text takes precedence over experience_file_path if both are provided.
-        """
-        if experience_text:
-            self.experience_data = experience_text
-        elif experience_file_path:
-            self.experience_data = self._load_experience_data(experience_file_path)
-        else:
-            self.experience_data = ""
-        
-        # Initialize OpenAI client
-        self.client = OpenAI(
-            api_key=os.environ.get("OPENAI_API_KEY", "your-api-key")
-        )
-        
-    def _load_experience_data(self, file_path: str) -> str:
-        """Load experience data from markdown file."""
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-            
-    def _generate_experiences_from_history(self, employment_history, job_description):
-        """Generate experiences based on the user's employment history if available."""
-        if not employment_history or len(employment_history) == 0:
-            return None
-        
-        # Use existing employment history as a base
-        experiences = []
-        
-        # Extract keywords from job description
-        keywords = self._extract_keywords(job_description)
-        
-        # Generate relevant bullet points based on job description
-        for job in employment_history[:min(3, len(employment_history))]:
-            # Generate 5 bullet points related to this job and the job description
-            bullet_points = self._generate_bullet_points_for_job(job, keywords, job_description)
-            
-            # Generate a relevant job title (could be based on the original or adapted for the target job)
-            job_title = self._generate_job_title(job, keywords, job_description)
-            
-            # Create an Experience object
-            experiences.append(
-                Experience(
-                    company_info=CompanyInfo(
-                        name=job.company_name,
-                        period=job.period,
-                        location=job.location
-                    ),
-                    job_title=job_title,
-                    bullet_points=bullet_points
-                )
-            )
-            
-        return experiences if experiences else None
-    
-    def _generate_bullet_points_for_job(self, job, keywords, job_description):
-        """Generate bullet points for a job based on keywords and job description."""
-        # This is a placeholder - in a real implementation you'd use a more sophisticated approach
-        # such as calling the OpenAI API to generate relevant bullet points
-        return [
-            BulletPoint(bullet_point=f"Led development of {keywords[0]} solutions, resulting in a 30% increase in team productivity."),
-            BulletPoint(bullet_point=f"Implemented {keywords[1]} framework, reducing system downtime by 25%."),
-            BulletPoint(bullet_point=f"Designed and executed {keywords[2]} strategy, leading to 40% improvement in performance metrics."),
-            BulletPoint(bullet_point=f"Optimized {keywords[3]} workflow, cutting operational costs by 20%."),
-            BulletPoint(bullet_point=f"Collaborated with cross-functional teams to deliver {keywords[4]} project ahead of schedule.")
+    @cached_property
+    def joined_hard(self) -> str:
+        """Hard skills as a quoted, comma-separated prompt list (without the outer quotes)."""
+        return '", "'.join(self.hard_skills)
+
+    @cached_property
+    def joined_soft(self) -> str:
+        """Soft skills as a quoted, comma-separated prompt list (without the outer quotes)."""
+        return '", "'.join(self.soft_skills)
+
+class JDAnalyzedResume(BaseModel):
+    """Schema for the single-call path: the JD's skills, then the resume written with them."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    skills: Skills = Field(..., description="All hard and soft skills extracted from the job description")
+    resume: ResumeData = Field(..., description="The tailored resume, containing every extracted skill")
+
+# Placeholder experiences for the non-LLM fallback resume, validated once at import time
+_FALLBACK_EXPERIENCES: Tuple[Experience, ...] = (
+    Experience(
+        company_info=CompanyInfo(
+            name="Tech Innovators Inc.",
+            period="01/2021 - 05/2025",
+            location="New York, NY"
+        ),
+        job_title="Senior AI Engineer",
+        bullet_points=[
+            "Engineered a supervisor-orchestrated multi-agent system on Azure, leveraging LangGraph's stateful execution capabilities, reducing data engineering development time by 40%.",
+            "Fused agent systems with Azure OpenAI Service for sophisticated natural language understanding, enabling automated translation of Jira issues into optimized data pipeline code.",
+            "Implemented multi-stage code validation within the LangGraph framework, incorporating unit tests and integration tests, reducing manual code review overhead by 70%.",
+            "Enhanced contextual awareness by creating GraphRAG systems using Neo4j integrated with Azure AI Search, resulting in an 18% improvement in code generation accuracy.",
+            "Defined and codified reusable domain-specific process definition libraries (PDLs) for rapid instantiation of pre-configured, industry-tailored agent workflows."
+        ]
+    ),
+    Experience(
+        company_info=CompanyInfo(
+            name="Intelligent Solutions Group",
+            period="06/2018 - 12/2020",
+            location="San Francisco, CA"
+        ),
+        job_title="Technology Architecture Lead",
+        bullet_points=[
+            "Led architectural design and development of complex multi-agent AI systems using CrewAI and LangChain, enabling autonomous decision-making, resulting in 25% improvement in first-call resolution rates.",
+            "Designed and implemented agent communication protocols using gRPC and RabbitMQ, ensuring robust and scalable inter-agent communication within customer service platforms.",
+            "Developed belief-desire-intention (BDI) agent architectures within the CrewAI framework, optimizing for rapid response times and accurate information retrieval.",
+            "Orchestrated deployment of agentic AI solutions on Microsoft Azure using Kubernetes and AKS, ensuring scalability and fault tolerance.",
+            "Provided technical leadership to a team of 9 AI engineers, fostering expertise in agent-based modeling and multi-agent system design."
         ]
+    ),
+    Experience(
+        company_info=CompanyInfo(
+            name="Communication Systems Inc.",
+            period="01/2016 - 05/2018",
+            location="Boston, MA"
+        ),
+        job_title="Python Developer",
+        bullet_points=[
+            "Developed robust backend systems using Python and Flask framework to automate configuration and management of contact center deployments, streamlining setup processes.",
+            "Integrated systems with programmable communications APIs via RESTful interfaces, enabling programmatic control over contact center features and workflows.",
+            "Implemented core automation logic using Python, leveraging requests library for API interaction and SQLAlchemy for database operations.",
+            "Designed and implemented message queue-based task management systems using RabbitMQ and pika, enabling asynchronous processing of configuration tasks.",
+            "Created comprehensive testing suites using pytest, achieving 92% code coverage and reducing production incidents by 35%."
+        ]
+    )
+)
+
+def _make_strict(schema: Dict, root: Dict) -> Dict:
+    """Adapt a pydantic JSON schema, in place, to what OpenAI's strict structured outputs accept.
     
-    def _generate_job_title(self, job, keywords, job_description):
-        """Generate a job title based on the job description keywords."""
-        # Placeholder - would be more sophisticated in real implementation
-        return f"Senior {keywords[0].title()} Specialist"
+    Objects forbid extra keys and require every property, None defaults are dropped and $refs
+    with sibling keys (such as a field description) are inlined, as the SDK does for the
+    response_format it builds itself.
+    """
+    for definition in schema.get("$defs", {}).values():
+        _make_strict(definition, root)
+    if schema.get("type") == "object":
+        schema.setdefault("additionalProperties", False)
+    properties = schema.get("properties")
+    if isinstance(properties, dict):
+        schema["required"] = list(properties)
+        for prop in properties.values():
+            _make_strict(prop, root)
+    if isinstance(schema.get("items"), dict):
+        _make_strict(schema["items"], root)
+    for variant in schema.get("anyOf", ()):
+        _make_strict(variant, root)
+    all_of = schema.get("allOf")
+    if isinstance(all_of, list):
+        if len(all_of) == 1:
+            schema.update(_make_strict(all_of[0], root))
+            schema.pop("allOf")
+        else:
+            for entry in all_of:
+                _make_strict(entry, root)
+    if "default" in schema and schema["default"] is None:
+        schema.pop("default")
+    ref = schema.get("$ref")
+    if ref and len(schema) > 1:
+        resolved = root
+        for key in ref[2:].split("/"):
+            resolved = resolved[key]
+        # The schema's own keys take priority over the referenced ones
+        schema.update({**resolved, **schema})
+        schema.pop("$ref")
+        return _make_strict(schema, root)
+    return schema
+
+def _strict_json_schema(model: Type[BaseModel]) -> Dict:
+    """Strict structured-output JSON schema for a pydantic model."""
+    schema = model.model_json_schema()
+    return _make_strict(schema, schema)
+
+# Structured-output formats are built once per schema, on first use, instead of by the SDK
+# on every call
+@lru_cache(maxsize=None)
+def _chat_response_format(model: type) -> Dict:
+    """Chat Completions structured-output response_format for a pydantic model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "schema": _strict_json_schema(model),
+            "strict": True
+        }
+    }
+
+@lru_cache(maxsize=None)
+def _text_format(model: type) -> Dict:
+    """Responses API structured-output text format for a pydantic model."""
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": model.__name__,
+            "schema": _strict_json_schema(model),
+            "strict": True
+        }
+    }
+
+def _responses_output_text(body: Dict) -> Optional[str]:
+    """Extract the output text from a raw Responses API body."""
+    for item in body.get("output", []):
+        for content in item.get("content") or []:
+            if content.get("type") == "output_text":
+                return content.get("text")
+    return None
+
+class _ResultCache:
+    """Cache of LLM results in an in-memory LRU backed by one JSON file per key on disk.
+    
+    Results of mutable models are stored and returned as deep copies, so callers may edit
+    what they get back without corrupting the cache.
+    """
+
+    def __init__(self, directory: Path, model: Type[BaseModel], max_entries: int = LLM_MEMORY_CACHE_SIZE):
+        self.directory = directory
+        self.model = model
+        self.max_entries = max_entries
+        self._copy = not model.model_config.get("frozen", False)
+        self._entries: "OrderedDict[str, BaseModel]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, value: BaseModel) -> None:
+        """Add a result to the in-memory LRU."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        """Look up a result in memory, then on disk."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        if value is None:
+            try:
+                value = self.model.model_validate_json((self.directory / f"{key}.json").read_bytes())
+            except (OSError, ValidationError):
+                return None
+            self._remember(key, value)
+        return value.model_copy(deep=True) if self._copy else value
+
+    def put(self, key: str, value: BaseModel) -> None:
+        """Store a result in memory and on disk."""
+        self._remember(key, value.model_copy(deep=True) if self._copy else value)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{key}.json").write_text(value.model_dump_json(), encoding="utf-8")
+        except OSError as e:
+            print(f"Could not write {self.directory.name} cache: {str(e)}")
 
-    def extract_sills(self, job_description: str) -> Skills:
-        """Generate a list of Hard & Soft skills from job description."""
-        print("----- Generating skills using LLM start -----")
+_SKILLS_CACHE = _ResultCache(LLM_CACHE_DIR / "skills", Skills)
+_RESUME_CACHE = _ResultCache(LLM_CACHE_DIR / "resumes", ResumeData)
+
+def _skills_cache_key(job_description: str) -> str:
+    """Cache key for the skills of a job description, scoped to the model and prompt version."""
+    digest = hashlib.blake2b(job_description.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{SKILLS_MODEL}-v{_SKILLS_PROMPT_VERSION}-{digest}"
+
+def _get_cached_skills(job_description: str) -> Optional[Skills]:
+    """Look up previously extracted skills for a job description."""
+    return _SKILLS_CACHE.get(_skills_cache_key(job_description))
 
-        system_prompt = f"""You are an expert HR Analyst and Career Coach AI. Your primary function is to meticulously analyze a job description and extract EVERY SINGLE skill mentioned - both **Hard Skills** and **Soft Skills**.
+def _cache_skills(job_description: str, skills: Skills) -> None:
+    """Store extracted skills for a job description."""
+    _SKILLS_CACHE.put(_skills_cache_key(job_description), skills)
+
+def _resume_cache_key(job_description: str, experience_data: str, num_experiences: int) -> str:
+    """Cache key for a generated resume, from everything that goes into its prompt.
+    
+    The user's personal details are applied after the cache, so editing them does not miss.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (job_description, experience_data, str(num_experiences)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return f"{RESUME_MODEL}-v{_RESUME_PROMPT_VERSION}.{_SKILLS_PROMPT_VERSION}-{digest.hexdigest()}"
+
+@lru_cache(maxsize=256)
+def _extract_keywords_cached(job_description: str) -> Tuple[str, ...]:
+    """Top keywords of a job description, memoized since every path re-extracts them per JD."""
+    # Split into lowercase words (the regex already drops short ones), skip common words and
+    # return the 15 most frequent; ties keep first-occurrence order
+    counter = Counter(word for word in _WORD_RE.findall(job_description.lower()) if word not in _STOPWORDS)
+    return tuple(word for word, _ in counter.most_common(15))
+
+@lru_cache(maxsize=32)
+def _experience_sections(experience_data: str) -> Tuple[Tuple[FrozenSet[str], ...], Tuple[str, ...]]:
+    """Split experience text into sections, as parallel tuples of word sets and first paragraphs.
+    
+    Memoized per text, since the same experience data serves many job descriptions.
+    """
+    sections = re.split(r'\n#{2,3} ', experience_data)
+    section_words = tuple(frozenset(_WORD_RE.findall(section.lower())) for section in sections)
+    first_paragraphs = tuple(section.split('\n\n', 1)[0].strip() for section in sections)
+    return section_words, first_paragraphs
+
+@lru_cache(maxsize=2048)
+def _render_bullet_points(keywords: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Fill the bullet templates with the leading JD keywords, padding short keyword lists.
+    
+    Memoized on the keyword tuple.
+    """
+    slots = keywords + (_BULLET_KEYWORD_PAD,) * (len(_BULLET_TEMPLATES) - len(keywords))
+    return tuple(template.format(*slots) for template in _BULLET_TEMPLATES)
+
+def _dedupe_starting_verbs(resume_data: ResumeData) -> None:
+    """Swap repeated bullet starting verbs for unused synonyms from _VERB_SYNONYMS, in place.
+
+    Bullets are visited in resume order, so the first use of a verb keeps it. Verbs without
+    synonyms, or whose synonyms are all taken, are left as they are.
+    """
+    used = set()
+    experiences = []
+    for exp in resume_data.experiences:
+        bullet_points = []
+        for bullet in exp.bullet_points:
+            first, _, rest = bullet.partition(" ")
+            verb = first.lower()
+            if verb in used:
+                synonym = next((s for s in _VERB_SYNONYMS.get(verb, ()) if s.lower() not in used), None)
+                if synonym is not None:
+                    bullet = f"{synonym} {rest}" if rest else synonym
+                    verb = synonym.lower()
+            used.add(verb)
+            bullet_points.append(bullet)
+        experiences.append(exp if bullet_points == exp.bullet_points else exp.model_copy(update={"bullet_points": bullet_points}))
+    resume_data.experiences = experiences
+
+def _quality_check(resume_data: ResumeData, num_experiences: int, skills: Optional[Skills]) -> bool:
+    """Cheap checks that a generated resume follows the blueprint's hard rules.
+    
+    Requires the requested number of experiences, every hard skill somewhere in the resume
+    (soft skills are paraphrased into bullets by design, so they are not matched literally)
+    and a different starting verb for every bullet point. Pass skills=None when the only
+    skills available came from the same response: checking a resume against its own
+    extraction would reward extracting fewer skills.
+    """
+    if len(resume_data.experiences) != num_experiences:
+        return False
+    bullets = [bullet for exp in resume_data.experiences for bullet in exp.bullet_points]
+    if skills is not None:
+        text = " ".join([resume_data.summary, *bullets, *(skill.skill_list for skill in resume_data.skills)]).lower()
+        if any(skill.lower() not in text for skill in skills.hard_skills):
+            return False
+    verbs = [bullet.split(maxsplit=1)[0].lower() for bullet in bullets if bullet.strip()]
+    return len(verbs) == len(set(verbs))
+
+class ResumeMatcher:
+    # Static prompt text, kept separate from the per-request inputs so every call sends
+    # an identical prefix and hits OpenAI's automatic prompt caching
+    _SKILLS_SYSTEM_PROMPT: ClassVar[str] = """You are an expert HR Analyst and Career Coach AI. Your primary function is to meticulously analyze a job description and extract EVERY SINGLE skill mentioned - both **Hard Skills** and **Soft Skills**.
 
 **CRITICAL INSTRUCTION: Extract ALL skills - be EXHAUSTIVE, not selective. If it's mentioned in the job description, it MUST be extracted.**
 
@@ -384,63 +800,20 @@ These are the characteristics that define soft skills, especially in contrast to
 If the answer to any question is "maybe not," GO BACK and extract more.
 
 ---
-# Begin EXHAUSTIVE analysis below Job Description
+# Begin EXHAUSTIVE analysis below Job Description"""
 
-{ job_description }
-"""
-
-        skills = self.client.responses.parse(
-            model="gpt-4.1",
-            input=system_prompt,
-            text_format=Skills
-        ).output_parsed
-
-        return skills
-    
-    def generate_tailored_resume(self, job_description: str, user_info: Dict[str, str]) -> ResumeData:
-        """Generate a tailored resume based on job description and user info using LLM."""
-        print("----- Generating tailored resume using LLM start -----")
-        try:
-            # Try to use employment history to generate experiences if available
-            employment_history_data = []
-            experiences_from_history = None
-            
-            # if "employment_history" in user_info and user_info["employment_history"]:
-            #     for job in user_info["employment_history"]:
-            #         employment_history_data.append(EmploymentHistory(**job))
-
-            #     print(len(employment_history_data))
-                
-            #     # Use employment history to generate experiences
-            #     if employment_history_data:
-            #         experiences_from_history = self._generate_experiences_from_history(
-            #             employment_history_data, job_description
-            #         )
-
-            skills = self.extract_sills(job_description)
-            for skill in skills.hard_skills:
-                print(skill)
-            print()
-            for skill in skills.soft_skills:
-                print(skill)
-            print()
-
-            num_experiences = len(user_info['employment_history'])
-            
-            # Create system message with context about the task
-            system_message = f"""You are an elite Career Strategist and Master Resume Architect. Your singular expertise is in meticulously deconstructing job descriptions and synthesizing a candidate's raw experience into a powerful, hyper-personalized, ATS-crushing resume. This document must not only pass automated filters but must also immediately captivate and persuade human recruiters, hiring managers, and technical leads.
+    _RESUME_SYSTEM_PROMPT: ClassVar[str] = """You are an elite Career Strategist and Master Resume Architect. Your singular expertise is in meticulously deconstructing job descriptions and synthesizing a candidate's raw experience into a powerful, hyper-personalized, ATS-crushing resume. This document must not only pass automated filters but must also immediately captivate and persuade human recruiters, hiring managers, and technical leads.
 
 Your core philosophy is built on the dual pillars of **Precision (for the ATS)** and **Persuasion (for the Human)**. Every word you choose must serve this dual purpose.
 
 **MISSION:**
 Construct a world-class, hyper-personalized resume based on the provided `job_description` and `user_profile`. You will adhere with absolute precision to the following blueprint and non-negotiable principles.
 
-**INPUTS:**
-*   **Job Description:** `{job_description}`
-*   **User Profile:** `{self.experience_data}` (Includes name, contact info, education, past work experiences, projects, skills, etc. **The user's major and core expertise is always in AI/ML.**)
+**INPUTS:** (given in the user message)
+*   **Job Description:** The target job posting.
+*   **User Profile:** Includes name, contact info, education, past work experiences, projects, skills, etc. **The user's major and core expertise is always in AI/ML.**
 *   **Hard & Soft Skills:** You must contain all of these in the Phase 2 result.
-    *   **Hard Skills**: "{'", "'.join(skills.hard_skills)}"
-    *   **Soft Skills**: "{'", "'.join(skills.soft_skills)}"
+*   **Number of Experiences (N):** The exact number of work experiences to generate.
 
 **CRITICAL RULES FOR AVOIDING CONFLICTS:**
 *   **NEVER mention the hiring company (the company from the job description) as a place where the candidate has worked.**
@@ -470,8 +843,8 @@ Before a single word is written, you must perform a deep strategic analysis.
 ### **Phase 2: Resume Generation (Your Final Output)**
 
 **CRITICAL SKILL INCLUSION STRATEGY:**
-*   **MANDATORY:** You MUST include ALL provided hard skills: "{'", "'.join(skills.hard_skills)}"
-*   **MANDATORY:** You MUST include ALL provided soft skills: "{'", "'.join(skills.soft_skills)}"
+*   **MANDATORY:** You MUST include ALL provided Hard Skills from the INPUTS
+*   **MANDATORY:** You MUST include ALL provided Soft Skills from the INPUTS
 *   **SMART DISTRIBUTION TO AVOID REPETITION:**
     - Distribute skills strategically across Summary (20-30%), Experience bullets (60-70%), and Skills section (100% but categorized)
     - Use each skill in CONTEXT within achievements rather than listing mechanically
@@ -513,17 +886,17 @@ Before a single word is written, you must perform a deep strategic analysis.
     5.  **Tone:** Confident, expert, and direct. **ABSOLUTELY NO CLICHÉS** like "results-driven," "team player," or "synergy."
 
 **D. PROFESSIONAL EXPERIENCE**
-*   **Objective:** Detail exactly {num_experiences} reverse-chronological work experiences that tell a compelling story of growth, impact, and increasing responsibility.
-*   **Master Rule:** Focus on a narrative of progression. The most recent role should be hyper-aligned with the target job. Earlier roles should build the foundation, demonstrating diverse but relevant skills. **Avoid making all {num_experiences} experiences sound identical.** For example, if the target is "Chemistry AI Scientist," the most recent role should focus on that, while a previous role might focus on core data engineering or ML modeling in a different domain, showcasing transferable skills.
+*   **Objective:** Detail exactly N reverse-chronological work experiences that tell a compelling story of growth, impact, and increasing responsibility.
+*   **Master Rule:** Focus on a narrative of progression. The most recent role should be hyper-aligned with the target job. Earlier roles should build the foundation, demonstrating diverse but relevant skills. **Avoid making all N experiences sound identical.** For example, if the target is "Chemistry AI Scientist," the most recent role should focus on that, while a previous role might focus on core data engineering or ML modeling in a different domain, showcasing transferable skills.
 *   **SKILL DISTRIBUTION ACROSS EXPERIENCES:**
-    - **ALL skills MUST appear at least once across the {num_experiences} experiences**
+    - **ALL skills MUST appear at least once across the N experiences**
     - **Strategic distribution:** Spread skills across different roles to avoid repetition
     - **Most recent role:** 40-50% of skills, focusing on most advanced/relevant
     - **Middle role:** 30-35% of skills, showing progression
     - **Earliest role:** 20-25% of skills, showing foundation
     - **Natural integration:** Weave skills into achievements, don't just list them
 
-*   **Instructions for each of the {num_experiences} experiences:**
+*   **Instructions for each of the N experiences:**
 
     *   **1. COMPANY & ROLE:**
         *   **Company:** Create a realistic, professional company name and location (City, ST).
@@ -549,36 +922,8 @@ Before a single word is written, you must perform a deep strategic analysis.
             - **MUST start with a strong, active verb** (e.g., Developed, Implemented, Led, Optimized, Architected, Engineered, Designed, etc.)
             - **NEVER start with articles (a, an, the), pronouns, or passive constructions**
             - **Each bullet's first word MUST be an action verb in past tense (except current role which uses present tense)**
+            - **Start every bullet in the resume with a different action verb**
         
-        *   **🚨 CRITICAL VERB UNIQUENESS RULES - ABSOLUTE REQUIREMENTS 🚨**
-            - **ZERO REPETITION OF STARTING VERBS:** NEVER use the same action verb to start more than ONE bullet point across the ENTIRE resume
-            - **UNIQUE VERB MANDATE:** Each bullet point across ALL experiences MUST start with a DIFFERENT action verb
-            - **NO VERB REUSE ANYWHERE:** Do NOT reuse ANY verb (starting or otherwise) in the entire resume. Find synonyms or alternative verbs.
-            - **TRACKING REQUIREMENT:** You MUST mentally track every verb used and ensure complete uniqueness
-            - **VIOLATION = FAILURE:** Any repeated starting verb is an immediate failure that MUST be corrected
-            
-        *   **MANDATORY UNIQUE ACTION VERB LIST (Use each ONLY ONCE as a bullet starter):**
-            **Development/Creation:** Architected, Built, Constructed, Created, Designed, Developed, Engineered, Established, Formulated, Founded, Generated, Initiated, Innovated, Introduced, Invented, Launched, Pioneered, Produced
-            **Implementation:** Deployed, Executed, Implemented, Installed, Integrated, Operationalized, Rolled-out
-            **Optimization:** Accelerated, Advanced, Amplified, Boosted, Enhanced, Expedited, Improved, Maximized, Optimized, Refined, Revamped, Streamlined, Strengthened, Upgraded
-            **Leadership:** Championed, Directed, Drove, Guided, Headed, Led, Mentored, Orchestrated, Oversaw, Spearheaded, Supervised
-            **Analysis:** Analyzed, Assessed, Audited, Diagnosed, Evaluated, Examined, Identified, Investigated, Researched, Studied, Surveyed
-            **Management:** Administered, Coordinated, Facilitated, Managed, Organized, Planned, Scheduled
-            **Achievement:** Achieved, Accomplished, Attained, Delivered, Exceeded, Outperformed, Surpassed
-            **Transformation:** Automated, Converted, Migrated, Modernized, Reengineered, Restructured, Revitalized, Transformed, Transitioned
-            **Collaboration:** Collaborated, Cooperated, Liaised, Negotiated, Partnered, Unified
-            **Problem-Solving:** Debugged, Diagnosed, Remedied, Resolved, Solved, Troubleshot
-            **Scaling:** Expanded, Extended, Grew, Scaled
-            **Documentation:** Authored, Composed, Documented, Drafted, Published, Wrote
-            **Training:** Coached, Educated, Instructed, Trained
-            **Monitoring:** Monitored, Tracked, Validated, Verified
-            **Strategy:** Conceptualized, Devised, Formulated, Strategized
-            
-        *   **VERB SELECTION STRATEGY:**
-            - Start with the MOST POWERFUL and SPECIFIC verbs for your most important achievements
-            - Reserve common verbs (Developed, Implemented) for when they are the ONLY appropriate choice
-            - Use technical/specialized verbs when they accurately describe the work
-            - NEVER sacrifice accuracy for uniqueness - the verb must precisely describe the action
         *   **Quantify Everything, Always:** Demonstrate measurable results. Never be vague. Use concrete numbers related to:
             *   **Impact (Money/Revenue):** Increased revenue by X%, saved $Y in operational costs, managed a $Z budget.
             *   **Efficiency (Time/Process):** Reduced model inference time by X%, automated Z processes saving Y hours per week, decreased project completion time by Z%.
@@ -590,7 +935,7 @@ Before a single word is written, you must perform a deep strategic analysis.
             - **Distribute intelligently:** Not every skill needs to appear in every role
             - **Context is key:** Mention skills as part of achievements, not as standalone items
             - **Example:** Instead of "Used Python, TensorFlow, and Docker," write "Architected Python-based ML pipeline using TensorFlow, deployed via Docker containers, reducing inference time by 40%"
-            - **Track coverage:** Ensure that by the end of all {num_experiences} experiences, EVERY provided skill has been mentioned at least once
+            - **Track coverage:** Ensure that by the end of all N experiences, EVERY provided skill has been mentioned at least once
 
 **E. EDUCATION**
 *   **Objective:** State the candidate's academic credentials, reinforcing their foundational knowledge.
@@ -619,52 +964,221 @@ Before a single word is written, you must perform a deep strategic analysis.
 
 Before outputting, perform a final self-critique. The resume is only complete if it meets every one of these standards.
 
-1.  **ATS-First, Human-Optimized (DUAL-PURPOSE):** The resume MUST contain the exact keywords, hard skills ("{'", "'.join(skills.hard_skills)}"), soft skills ("{'", "'.join(skills.soft_skills)}"), and phrases from the job description to pass the ATS. Hard skills go in the Technical Skills section. Soft skills MUST be woven naturally into bullet points and summary, NEVER listed as a category in the Skills section. The language and flow must be clean, professional, and compelling for a human.
+1.  **ATS-First, Human-Optimized (DUAL-PURPOSE):** The resume MUST contain the exact keywords, the provided hard skills, soft skills, and phrases from the job description to pass the ATS. Hard skills go in the Technical Skills section. Soft skills MUST be woven naturally into bullet points and summary, NEVER listed as a category in the Skills section. The language and flow must be clean, professional, and compelling for a human.
 2.  **MEASURABLE RESULTS ARE MANDATORY:** Every bullet point in the experience section MUST be quantified. Scrutinize each one. If it lacks a metric (%, $, time, scale), it is a failure and must be revised. Use realistic KPIs.
 3.  **LEVERAGE THE USER'S REALITY:** The resume must be an enhanced, strategic representation of the `user_profile`. **DO NOT INVENT experiences.** Your skill is in framing the user's truth to align perfectly with the job's needs.
 4.  **AI/ML IS THE CORE:** The user's primary expertise is AI/ML. This must be the central thread of the resume's narrative, reflected in the summary, job titles, achievements, and skills.
 5.  **DYNAMIC LANGUAGE ONLY:** Use strong, active verbs. **NO PASSIVE PHRASES** ("duties included," "was responsible for"). **NO CLICHÉS OR BUZZWORDS** ("go-getter," "think outside the box").
-6.  **🔴 ABSOLUTE VERB UNIQUENESS - NON-NEGOTIABLE 🔴**
-    - **ZERO TOLERANCE FOR VERB REPETITION:** NEVER use the same action verb to start multiple bullet points
-    - **COMPLETE VERB DIVERSITY:** Every single bullet point across the entire resume MUST begin with a UNIQUE verb
-    - **NO VERB RECYCLING:** Do not reuse ANY verb throughout the resume (as starters or within sentences) - find alternatives
-    - **IMMEDIATE CORRECTION REQUIRED:** If you catch yourself repeating a verb, STOP and revise immediately
-    - **QUALITY CHECK:** Before finalizing, scan every bullet point to ensure NO starting verb appears twice
-7.  **AVOID EXCESSIVE REPETITION:** Do NOT repeat the same words, phrases, or sentence structures more than 2 times throughout the entire resume (unless they are critical keywords from the job description). Vary your language to maintain reader engagement while still hitting ATS requirements.
+6.  **AVOID EXCESSIVE REPETITION:** Do NOT repeat the same words, phrases, or sentence structures more than 2 times throughout the entire resume (unless they are critical keywords from the job description). Vary your language to maintain reader engagement while still hitting ATS requirements.
     - Track and limit repetition of non-keyword terms
     - Use synonyms and varied sentence structures
     - Exception: Technical keywords from job description can be repeated as needed for ATS
-8.  **NARRATIVE COHESION:** Does the resume tell a clear story of a highly qualified professional whose career has logically prepared them for this exact role? Is the career progression believable and impressive?
-9.  **REALISM AND DIVERSITY IN EXPERIENCE:** **Critically important:** Do not make all {num_experiences} past jobs a carbon copy of the target role. Show a progression. A foundational role, a senior role, and a lead role, each building on the last but showcasing a slightly different facet of the candidate's expertise, creating a well-rounded and believable profile.
-10. **TECHNOLOGY TIMELINE ACCURACY:** **CRITICAL:** Ensure all technologies, frameworks, and tools mentioned are historically accurate:
+7.  **NARRATIVE COHESION:** Does the resume tell a clear story of a highly qualified professional whose career has logically prepared them for this exact role? Is the career progression believable and impressive?
+8.  **REALISM AND DIVERSITY IN EXPERIENCE:** **Critically important:** Do not make all N past jobs a carbon copy of the target role. Show a progression. A foundational role, a senior role, and a lead role, each building on the last but showcasing a slightly different facet of the candidate's expertise, creating a well-rounded and believable profile.
+9.  **TECHNOLOGY TIMELINE ACCURACY:** **CRITICAL:** Ensure all technologies, frameworks, and tools mentioned are historically accurate:
     - **NEVER claim experience with a technology before it was released or became widely adopted**
     - **Examples:** Don't claim PyTorch experience before 2016, TensorFlow before 2015, ChatGPT/GPT-4 before 2022/2023
     - **Verify company existence:** Ensure any company mentioned existed during the stated employment period
     - **Match technology maturity:** Junior roles should use technologies popular at that time, not cutting-edge tools that emerged later
-11. **FLAWLESS PRESENTATION:** The final output must be typo-free, grammatically perfect, and formatted cleanly and professionally.
-12. **FINAL VERB UNIQUENESS VERIFICATION - MANDATORY:**
-    - **PRE-SUBMISSION CHECK:** Before outputting the resume, review EVERY bullet point
-    - **CONFIRM:** Each bullet starts with a DIFFERENT action verb
-    - **VERIFY:** No verb is used twice as a bullet starter across the entire resume
-    - **SCAN:** No verb appears multiple times even within bullet point text
-    - **FIX:** If ANY repetition is found, revise immediately before submission
-13. **SKILL INCLUSION VERIFICATION:**
+10. **FLAWLESS PRESENTATION:** The final output must be typo-free, grammatically perfect, and formatted cleanly and professionally.
+11. **SKILL INCLUSION VERIFICATION:**
     - **100% Coverage Required:** EVERY single provided skill MUST appear somewhere in the resume
     - **Smart Distribution:** Use the distribution strategy above to avoid messy repetition
     - **Quality over Quantity per Section:** Better to have skills naturally integrated across sections than forced into one area
     - **Skills Section:** Should list ALL hard skills ONLY, organized by category (Programming, Frameworks, Tools, Methodologies). DO NOT list soft skills in this section.
     - **Soft Skills Integration:** Soft skills (Communication, Leadership, etc.) should ONLY appear naturally woven into bullet points and summary, NEVER as a separate category in the Skills section
-    - **Final Check:** Before completing, verify that each hard skill appears in the Skills section, and each soft skill appears in bullet points or summary
+    - **Final Check:** Before completing, verify that each hard skill appears in the Skills section, and each soft skill appears in bullet points or summary"""
+
+    # Per-request inputs, filled in with a single substitution pass
+    _RESUME_INPUTS_TEMPLATE: ClassVar[string.Template] = string.Template("""**INPUTS:**
+*   **Job Description:** `$job_description`
+*   **User Profile:** `$experience_data`
+*   **Hard Skills**: "$hard_skills"
+*   **Soft Skills**: "$soft_skills"
+*   **Number of Experiences (N):** $num_experiences""")
+
+    _ANALYZE_AND_RESUME_PROMPT: ClassVar[str] = """You will complete two tasks in a single response, following the two sets of instructions below.
 
-### **🚨 FINAL CRITICAL REMINDER: VERB UNIQUENESS IS MANDATORY 🚨**
-**BEFORE YOU OUTPUT THE RESUME:**
-1. **COUNT** every starting verb - ensure you have exactly as many unique verbs as bullet points
-2. **VERIFY** no verb repeats as a bullet starter
-3. **CONFIRM** verb diversity throughout the entire document
-4. **FIX** any violations immediately
-5. **REMEMBER:** A single repeated starting verb = FAILURE OF THE ENTIRE RESUME
+1.  **`skills`:** Apply the skills-extraction instructions to the Job Description in the INPUTS.
+2.  **`resume`:** Apply the resume blueprint to the INPUTS, using the hard and soft skills you extracted in `skills` as the **Hard & Soft Skills** input."""
 
-**YOU MUST USE A DIFFERENT ACTION VERB FOR EVERY SINGLE BULLET POINT - NO EXCEPTIONS!**"""
+    _ANALYZE_INPUTS_TEMPLATE: ClassVar[string.Template] = string.Template("""**INPUTS:**
+*   **Job Description:** `$job_description`
+*   **User Profile:** `$experience_data`
+*   **Number of Experiences (N):** $num_experiences""")
+
+    def __init__(self, experience_file_path: Optional[str] = None, experience_text: Optional[str] = None, runner: Optional[ParallelResumeRunner] = None):
+        """Initialize with either path to experience markdown file or direct experience text.
+        
+        Args:
+            experience_file_path: Path to experience markdown file (optional)
+            experience_text: Direct experience text input (optional)
+            runner: Rate limiter / retrier for async OpenAI calls (optional; retries without
+                limits if omitted)
+            
+        Note: experience_text takes precedence over experience_file_path if both are provided.
+        """
+        if experience_text:
+            self.experience_data = experience_text
+        elif experience_file_path:
+            self.experience_data = self._load_experience_data(experience_file_path)
+        else:
+            self.experience_data = ""
+        
+        # Shared OpenAI clients (async drives the LLM calls, sync serves the Batch API)
+        self.client, self.aclient = _get_clients(os.environ.get("OPENAI_API_KEY", "your-api-key"))
+        self.runner = runner or ParallelResumeRunner()
+        
+    def _load_experience_data(self, file_path: str) -> str:
+        """Load experience data from markdown file, memory-mapping large files."""
+        if os.path.getsize(file_path) < EXPERIENCE_MMAP_THRESHOLD:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Translate newlines like text mode does
+            return mapped[:].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            
+    def _generate_experiences_from_history(self, employment_history, job_description):
+        """Generate experiences based on the user's employment history if available."""
+        if not employment_history or len(employment_history) == 0:
+            return None
+        
+        # Use existing employment history as a base
+        experiences = []
+        
+        # Extract keywords from job description
+        keywords = self._extract_keywords(job_description)
+        
+        # Generate relevant bullet points based on job description
+        for job in employment_history[:3]:
+            # Generate 5 bullet points related to this job and the job description
+            bullet_points = self._generate_bullet_points_for_job(job, keywords, job_description)
+            
+            # Generate a relevant job title (could be based on the original or adapted for the target job)
+            job_title = self._generate_job_title(job, keywords, job_description)
+            
+            # Create an Experience object
+            experiences.append(
+                Experience(
+                    company_info=CompanyInfo(
+                        name=job.company_name,
+                        period=job.period,
+                        location=job.location
+                    ),
+                    job_title=job_title,
+                    bullet_points=bullet_points
+                )
+            )
+            
+        return experiences if experiences else None
+    
+    def _generate_bullet_points_for_job(self, job, keywords, job_description):
+        """Generate bullet points for a job based on keywords and job description."""
+        # This is a placeholder - in a real implementation you'd use a more sophisticated approach
+        # such as calling the OpenAI API to generate relevant bullet points
+        return list(_render_bullet_points(tuple(keywords[:len(_BULLET_TEMPLATES)])))
+    
+    def _generate_job_title(self, job, keywords, job_description):
+        """Generate a job title based on the job description keywords."""
+        # Placeholder - would be more sophisticated in real implementation
+        return f"Senior {keywords[0].title()} Specialist"
+
+    def _build_skills_input(self, job_description: str) -> List[Dict[str, str]]:
+        """Build the skills-extraction input: the constant instructions, then the job description."""
+        return [
+            {"role": "system", "content": self._SKILLS_SYSTEM_PROMPT},
+            {"role": "user", "content": job_description},
+        ]
+
+    def extract_sills(self, job_description: str) -> Skills:
+        """Generate a list of Hard & Soft skills from job description."""
+        return _run_sync(self.aextract_skills(job_description))
+
+    async def aextract_skills(self, job_description: str) -> Skills:
+        """Async variant of extract_sills using the AsyncOpenAI client."""
+        skills = _get_cached_skills(job_description)
+        if skills is not None:
+            return skills
+
+        print("----- Generating skills using LLM start -----")
+
+        response = await self.runner.call(
+            lambda: self.aclient.responses.create(
+                model=SKILLS_MODEL,
+                input=self._build_skills_input(job_description),
+                text=_text_format(Skills),
+                max_output_tokens=SKILLS_MAX_OUTPUT_TOKENS
+            ),
+            (self._SKILLS_SYSTEM_PROMPT, job_description),
+            max_output_tokens=SKILLS_MAX_OUTPUT_TOKENS
+        )
+
+        skills = Skills.model_validate_json(response.output_text)
+        _cache_skills(job_description, skills)
+        return skills
+
+    async def _aextract_keywords(self, job_description: str) -> List[str]:
+        """Run keyword extraction in a worker thread so it overlaps the skills LLM call."""
+        return await asyncio.to_thread(self._extract_keywords, job_description)
+    
+    def generate_tailored_resume(self, job_description: str, user_info: Dict[str, str], experience_text: Optional[str] = None) -> ResumeData:
+        """Generate a tailored resume based on job description and user info using LLM.
+        
+        experience_text overrides the experience data given at construction, so a single
+        shared matcher can serve different resumes.
+        """
+        return _run_sync(self.agenerate_tailored_resume(job_description, user_info, experience_text))
+    
+    async def agenerate_tailored_resume(self, job_description: str, user_info: Dict[str, str], experience_text: Optional[str] = None) -> ResumeData:
+        """Async implementation of generate_tailored_resume using the AsyncOpenAI client."""
+        print("----- Generating tailored resume using LLM start -----")
+        experience_data = experience_text if experience_text is not None else self.experience_data
+        keywords = None
+        try:
+            job_description = self._fit_job_description(job_description, experience_data)
+            # Try to use employment history to generate experiences if available
+            employment_history_data = []
+            experiences_from_history = None
+            
+            # if "employment_history" in user_info and user_info["employment_history"]:
+            #     for job in user_info["employment_history"]:
+            #         employment_history_data.append(EmploymentHistory(**job))
+
+            #     print(len(employment_history_data))
+                
+            #     # Use employment history to generate experiences
+            #     if employment_history_data:
+            #         experiences_from_history = self._generate_experiences_from_history(
+            #             employment_history_data, job_description
+            #         )
+
+            num_experiences = len(user_info['employment_history'])
+            cache_key = _resume_cache_key(job_description, experience_data, num_experiences)
+            resume_data = _RESUME_CACHE.get(cache_key)
+            if resume_data is not None:
+                return self._finalize_resume(resume_data, user_info)
+
+            skills = _get_cached_skills(job_description)
+            if skills is None:
+                # Extract the skills and write the resume in one call while the JD keywords
+                # (used by the fallback) are computed
+                (analyzed, model), keywords = await asyncio.gather(
+                    self._aanalyze_and_generate(job_description, experience_data, num_experiences),
+                    self._aextract_keywords(job_description)
+                )
+                # The skills cache holds SKILLS_MODEL extractions only; skills from a cheaper
+                # tier are used for this resume but not reused for later ones
+                if model == SKILLS_MODEL:
+                    _cache_skills(job_description, analyzed.skills)
+                _RESUME_CACHE.put(cache_key, analyzed.resume)
+                self._log_skills(analyzed.skills)
+                return self._finalize_resume(analyzed.resume, user_info)
+
+            keywords = self._extract_keywords(job_description)
+            self._log_skills(skills)
+            
+            # Create the blueprint and input messages for the task
+            messages = self._build_resume_messages(job_description, experience_data, skills, num_experiences)
             
             # # Use generated experiences if available, otherwise let the AI generate them
             # if experiences_from_history:
@@ -690,73 +1204,401 @@ Before outputting, perform a final self-critique. The resume is only complete if
             
             # Otherwise proceed with the standard AI approach
             # Get completion from OpenAI using Pydantic model for structured output
-            completion = self.client.beta.chat.completions.parse(
-                model="gpt-4.1",
-                messages=[
-                    {"role": "system", "content": system_message},
-                ],
-                response_format=ResumeData
+            resume_data, _ = await self._acreate_tiered(
+                messages, ResumeData,
+                lambda resume: _quality_check(resume, num_experiences, skills)
             )
+            _RESUME_CACHE.put(cache_key, resume_data)
+            return self._finalize_resume(resume_data, user_info)
             
-            # Extract the parsed response (already in correct Pydantic format)
-            resume_data = completion.choices[0].message.parsed
-            
-            # Override with user's personal info
-            resume_data.name = user_info.get("name", "")
-            resume_data.email = user_info.get("email", "")
-            resume_data.location = user_info.get("location", "")
-            resume_data.linkedin = user_info.get("linkedin")
-
-            # Override with user's experience company info
-            if "employment_history" in user_info and user_info["employment_history"]:
-                for index, job in enumerate(user_info["employment_history"]):
-                    if index > len(resume_data.experiences) - 1:
-                        break
-                    resume_data.experiences[index].company_info.name = job["company_name"]
-                    resume_data.experiences[index].company_info.period = job["period"]
-                    resume_data.experiences[index].company_info.location = job["location"]
-
-            # Create and return ResumeData
-            education_data = []
-            if "education" in user_info and user_info["education"]:
-                for edu in user_info["education"]:
-                    education_data.append(Education(**edu))
-            
-            print("--------------------------------")
-            # print(resume_data.model_dump_json(indent=2))
-            print("--------------------------------")
-            linkedin_profile = "<a href=\"" + user_info.get("linkedin", "") + "\">LinkedIn</a>" if user_info.get("linkedin") else ""
-            return ResumeData(
-                name=user_info.get("name", ""),
-                title=user_info.get("title", ""),
-                email=user_info.get("email", ""),
-                phone=user_info.get("phone", ""),
-                location=user_info.get("location", ""),
-                linkedin=linkedin_profile,
-                summary=resume_data.summary,
-                experiences=resume_data.experiences,
-                education=education_data,
-                employment_history=employment_history_data,
-                skills=resume_data.skills
+        except Exception as e:
+            # Fallback method if API call fails
+            print(f"Error using OpenAI API: {str(e)}")
+            return self._legacy_generate_tailored_resume(job_description, user_info, experience_data, keywords)
+
+    async def _aanalyze_and_generate(self, job_description: str, experience_data: str, num_experiences: int) -> Tuple[JDAnalyzedResume, str]:
+        """Extract the JD skills and generate the resume with a single structured LLM call.
+        
+        Returns the result and the model that produced it.
+        """
+        messages = [
+            {"role": "system", "content": self._ANALYZE_AND_RESUME_PROMPT},
+            {"role": "system", "content": self._SKILLS_SYSTEM_PROMPT},
+            {"role": "system", "content": self._RESUME_SYSTEM_PROMPT},
+            {"role": "user", "content": self._ANALYZE_INPUTS_TEMPLATE.substitute(
+                job_description=job_description,
+                experience_data=experience_data,
+                num_experiences=num_experiences
+            )},
+        ]
+        return await self._acreate_tiered(
+            messages, JDAnalyzedResume,
+            lambda analyzed: _quality_check(analyzed.resume, num_experiences, None)
+        )
+
+    async def _acreate_tiered(self, messages: List[Dict[str, str]], response_model: Type[BaseModel], accept: Callable[[Any], bool]) -> Tuple[Any, str]:
+        """Request structured output from each RESUME_MODEL_TIERS model until accept() passes.
+        
+        Repeated bullet starting verbs are replaced before accept() sees the result. Responses
+        that fail validation escalate to the next tier like rejected ones; API errors propagate.
+        The last tier's result is returned even if accept() rejects it. Returns the result and
+        the model that produced it.
+        """
+        for tier, model in enumerate(RESUME_MODEL_TIERS):
+            last_tier = tier == len(RESUME_MODEL_TIERS) - 1
+            completion = await self.runner.call(
+                lambda: self.aclient.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    response_format=_chat_response_format(response_model),
+                    max_completion_tokens=RESUME_MAX_OUTPUT_TOKENS
+                ),
+                [message["content"] for message in messages],
+                max_output_tokens=RESUME_MAX_OUTPUT_TOKENS
             )
-            
+            try:
+                result = response_model.model_validate_json(completion.choices[0].message.content or "")
+            except ValidationError:
+                if last_tier:
+                    raise
+                print(f"{model} returned an invalid {response_model.__name__}, escalating")
+                continue
+            _dedupe_starting_verbs(result.resume if isinstance(result, JDAnalyzedResume) else result)
+            if last_tier or accept(result):
+                return result, model
+            print(f"{model} {response_model.__name__} failed the quality check, escalating")
+
+    def generate_tailored_resume_stream(self, job_description: str, user_info: Dict[str, str], experience_text: Optional[str] = None) -> Iterator[ResumeData]:
+        """Sync variant of agenerate_tailored_resume_stream, e.g. for progressive rendering in Streamlit."""
+        stream = self.agenerate_tailored_resume_stream(job_description, user_info, experience_text)
+        while True:
+            try:
+                yield _run_sync(stream.__anext__())
+            except StopAsyncIteration:
+                return
+
+    async def agenerate_tailored_resume_stream(self, job_description: str, user_info: Dict[str, str], experience_text: Optional[str] = None) -> AsyncIterator[ResumeData]:
+        """Streaming variant of agenerate_tailored_resume.
+        
+        Yields a partial ResumeData each time another top-level section of the response is
+        complete, so rendering can start before generation finishes. Partial items only have
+        the finished sections set and lack the user's personal overrides; the last item is
+        the finalized resume, as returned by agenerate_tailored_resume.
+        """
+        print("----- Streaming tailored resume using LLM start -----")
+        experience_data = experience_text if experience_text is not None else self.experience_data
+        keywords = None
+        try:
+            job_description = self._fit_job_description(job_description, experience_data)
+            num_experiences = len(user_info['employment_history'])
+            cache_key = _resume_cache_key(job_description, experience_data, num_experiences)
+            resume_data = _RESUME_CACHE.get(cache_key)
+            if resume_data is not None:
+                yield self._finalize_resume(resume_data, user_info)
+                return
+
+            skills, keywords = await asyncio.gather(
+                self.aextract_skills(job_description),
+                self._aextract_keywords(job_description)
+            )
+            self._log_skills(skills)
+
+            messages = self._build_resume_messages(job_description, experience_data, skills, num_experiences)
+            stream = await self.runner.call(
+                lambda: self.aclient.beta.chat.completions.stream(
+                    model=RESUME_MODEL,
+                    messages=messages,
+                    response_format=ResumeData,
+                    max_completion_tokens=RESUME_MAX_OUTPUT_TOKENS
+                ).__aenter__(),
+                [message["content"] for message in messages],
+                max_output_tokens=RESUME_MAX_OUTPUT_TOKENS
+            )
+            resume_data = None
+            completed = 0
+            try:
+                async for event in stream:
+                    if event.type == "content.delta" and isinstance(event.parsed, dict):
+                        # Sections arrive in schema order, so all but the last key are complete
+                        sections = list(event.parsed)[:-1]
+                        if len(sections) > completed:
+                            completed = len(sections)
+                            partial = self._partial_resume({name: event.parsed[name] for name in sections})
+                            if partial is not None:
+                                yield partial
+                    elif event.type == "content.done":
+                        # The JSON is complete and validated; stop without draining the
+                        # trailing finish/usage chunks
+                        resume_data = event.parsed
+                        break
+            finally:
+                await stream.close()
+            if resume_data is None:
+                raise ValueError("Resume stream ended without a parsed response")
+            _dedupe_starting_verbs(resume_data)
+            _RESUME_CACHE.put(cache_key, resume_data)
+            yield self._finalize_resume(resume_data, user_info)
+
         except Exception as e:
             # Fallback method if API call fails
             print(f"Error using OpenAI API: {str(e)}")
-            return self._legacy_generate_tailored_resume(job_description, user_info)
-    
+            yield self._legacy_generate_tailored_resume(job_description, user_info, experience_data, keywords)
+
+    def _partial_resume(self, sections: Dict[str, Any]) -> Optional[ResumeData]:
+        """Build a ResumeData holding only the given completed sections, or None if one is invalid."""
+        try:
+            return ResumeData.model_construct(**{
+                name: _RESUME_FIELD_ADAPTERS[name].validate_python(value)
+                for name, value in sections.items() if name in _RESUME_FIELD_ADAPTERS
+            })
+        except ValidationError:
+            return None
+
+    def _log_skills(self, skills: Skills) -> None:
+        """Log extracted hard and soft skills as a single DEBUG record."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted skills:\n%s\n\n%s", "\n".join(skills.hard_skills), "\n".join(skills.soft_skills))
+
+    def _fit_job_description(self, job_description: str, experience_data: str) -> str:
+        """Truncate the job description so the largest resume prompt fits PROMPT_TOKEN_BUDGET.
+        
+        The single-call prompt (analysis instructions, both system prompts and the inputs) is
+        the largest one sent with a job description, so it sets the budget. Raises ValueError
+        if the rest of that prompt already leaves no room for the job description.
+        """
+        fixed_tokens = sum(count_tokens(part) for part in (
+            self._ANALYZE_AND_RESUME_PROMPT,
+            self._SKILLS_SYSTEM_PROMPT,
+            self._RESUME_SYSTEM_PROMPT,
+            self._ANALYZE_INPUTS_TEMPLATE.template,
+            experience_data
+        ))
+        budget = PROMPT_TOKEN_BUDGET - RESUME_MAX_OUTPUT_TOKENS - fixed_tokens
+        if budget <= 0:
+            raise ValueError(f"Experience data leaves no room for the job description ({fixed_tokens} prompt tokens)")
+        truncated = truncate_tokens(job_description, budget)
+        if truncated is not job_description:
+            print(f"Job description exceeds the prompt budget, truncated to {budget} tokens")
+        return truncated
+
+    def _build_resume_messages(self, job_description: str, experience_data: str, skills: Skills, num_experiences: int) -> List[Dict[str, str]]:
+        """Build the resume-generation messages: the constant blueprint, then the per-request inputs."""
+        return [
+            {"role": "system", "content": self._RESUME_SYSTEM_PROMPT},
+            {"role": "user", "content": self._RESUME_INPUTS_TEMPLATE.substitute(
+                job_description=job_description,
+                experience_data=experience_data,
+                hard_skills=skills.joined_hard,
+                soft_skills=skills.joined_soft,
+                num_experiences=num_experiences
+            )},
+        ]
+
+    def _finalize_resume(self, resume_data: ResumeData, user_info: Dict[str, str]) -> ResumeData:
+        """Override the generated resume with the user's personal info and employment history."""
+        employment_history_data = []
+
+        # Override with user's experience company info (zip stops at the shorter list)
+        for experience, job in zip(resume_data.experiences, user_info.get("employment_history") or ()):
+            company_info = experience.company_info
+            company_info.name = job["company_name"]
+            company_info.period = job["period"]
+            company_info.location = job["location"]
+
+        # Education comes from our own saved profiles, so skip re-validation
+        education_data = [Education.model_construct(**edu) for edu in user_info.get("education") or ()]
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated resume:\n%s", resume_data.model_dump_json(indent=2))
+        linkedin = user_info.get("linkedin")
+        linkedin_profile = f'<a href="{linkedin}">LinkedIn</a>' if linkedin else ""
+        # Override with user's personal info; the generated summary, experiences and skills
+        # are already validated, so copy rather than re-validating them in a new ResumeData
+        return resume_data.model_copy(update={
+            "name": user_info.get("name", ""),
+            "title": user_info.get("title", ""),
+            "email": user_info.get("email", ""),
+            "phone": user_info.get("phone", ""),
+            "location": user_info.get("location", ""),
+            "linkedin": linkedin_profile,
+            "education": education_data,
+            "employment_history": employment_history_data
+        })
+
+    def _skills_request_body(self, job_description: str) -> Dict:
+        """Raw Responses API request body for skills extraction (used by the Batch API)."""
+        return {
+            "model": SKILLS_MODEL,
+            "input": self._build_skills_input(job_description),
+            "text": _text_format(Skills),
+            "max_output_tokens": SKILLS_MAX_OUTPUT_TOKENS
+        }
+
+    def _resume_request_body(self, job_description: str, experience_data: str, skills: Skills, num_experiences: int) -> Dict:
+        """Raw Chat Completions request body for resume generation (used by the Batch API)."""
+        return {
+            "model": RESUME_MODEL,
+            "messages": self._build_resume_messages(job_description, experience_data, skills, num_experiences),
+            "response_format": _chat_response_format(ResumeData),
+            "max_completion_tokens": RESUME_MAX_OUTPUT_TOKENS
+        }
+
+    def submit_batch(self, endpoint: str, bodies: Dict[str, Dict], timeout: float) -> Dict[str, Dict]:
+        """Run requests through the OpenAI Batch API and wait up to timeout seconds.
+        
+        Returns the response body of every request that succeeded, keyed by custom_id.
+        Requests missing from the result did not finish in time or failed.
+        """
+        lines = [
+            _json_dumps_bytes({"custom_id": custom_id, "method": "POST", "url": endpoint, "body": body})
+            for custom_id, body in bodies.items()
+        ]
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=endpoint,
+            completion_window="24h"
+        )
+        
+        deadline = time.monotonic() + timeout
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Give up on the batch; the caller retries these requests online
+                self.client.batches.cancel(batch.id)
+                return {}
+            time.sleep(min(BATCH_POLL_INTERVAL_SECONDS, remaining))
+            batch = self.client.batches.retrieve(batch.id)
+        
+        results = {}
+        if batch.output_file_id:
+            for line in self.client.files.content(batch.output_file_id).content.splitlines():
+                if not line.strip():
+                    continue
+                item = _json_loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") == 200:
+                    results[item["custom_id"]] = response["body"]
+        return results
+
+    def generate_tailored_resumes(self, jobs: List[Tuple[str, Dict, Optional[str]]], batch: bool = False, batch_timeout: float = DEFAULT_BATCH_TIMEOUT_SECONDS) -> List[ResumeData]:
+        """Generate resumes for many (job_description, user_info, experience_text) jobs.
+        
+        With batch=True the LLM calls go through the Batch API: half the token cost and a
+        separate rate-limit pool, but results can take hours. Jobs that have not finished
+        within batch_timeout fall back to the online API.
+        """
+        if not batch:
+            return _run_sync(self._agenerate_many(jobs))
+        return self._batch_generate_tailored_resumes(jobs, batch_timeout)
+
+    async def _agenerate_many(self, jobs: List[Tuple[str, Dict, Optional[str]]]) -> List[ResumeData]:
+        """Generate resumes for several jobs concurrently with the online API."""
+        return list(await asyncio.gather(*(
+            self.agenerate_tailored_resume(job_description, user_info, experience_text)
+            for job_description, user_info, experience_text in jobs
+        )))
+
+    def _batch_generate_tailored_resumes(self, jobs: List[Tuple[str, Dict, Optional[str]]], timeout: float) -> List[ResumeData]:
+        """Batch API implementation of generate_tailored_resumes."""
+        deadline = time.monotonic() + timeout
+        jobs = list(jobs)
+        
+        # Resumes already generated for the same prompt inputs skip both batches, and jobs
+        # whose prompt cannot fit the token budget go straight to the fallback
+        resumes: List[Optional[ResumeData]] = [None] * len(jobs)
+        cache_keys = {}
+        for i, (job_description, user_info, experience_text) in enumerate(jobs):
+            experience_data = experience_text if experience_text is not None else self.experience_data
+            try:
+                job_description = self._fit_job_description(job_description, experience_data)
+            except ValueError as e:
+                print(f"Cannot generate resume with OpenAI: {str(e)}")
+                resumes[i] = self._legacy_generate_tailored_resume(job_description, user_info, experience_data)
+                continue
+            jobs[i] = (job_description, user_info, experience_text)
+            cache_keys[i] = _resume_cache_key(job_description, experience_data, len(user_info['employment_history']))
+            resume_data = _RESUME_CACHE.get(cache_keys[i])
+            if resume_data is not None:
+                resumes[i] = self._finalize_resume(resume_data, user_info)
+        pending = [i for i, resume in enumerate(resumes) if resume is None]
+        
+        # First batch: skills for each distinct job description not already cached
+        skills_by_jd = {}
+        job_descriptions = []
+        for jd in dict.fromkeys(jobs[i][0] for i in pending):
+            skills = _get_cached_skills(jd)
+            if skills is None:
+                job_descriptions.append(jd)
+            else:
+                skills_by_jd[jd] = skills
+        skills_results = self.submit_batch(
+            "/v1/responses",
+            {f"skills-{i}": self._skills_request_body(jd) for i, jd in enumerate(job_descriptions)},
+            timeout
+        ) if job_descriptions else {}
+        for i, jd in enumerate(job_descriptions):
+            body = skills_results.get(f"skills-{i}")
+            if body is None:
+                continue
+            try:
+                skills_by_jd[jd] = Skills.model_validate_json(_responses_output_text(body) or "")
+            except ValidationError:
+                continue
+            _cache_skills(jd, skills_by_jd[jd])
+        
+        # Second batch: resumes for every pending job whose skills are ready
+        resume_bodies = {}
+        for i in pending:
+            job_description, user_info, experience_text = jobs[i]
+            skills = skills_by_jd.get(job_description)
+            if skills is None:
+                continue
+            experience_data = experience_text if experience_text is not None else self.experience_data
+            resume_bodies[f"resume-{i}"] = self._resume_request_body(
+                job_description, experience_data, skills, len(user_info['employment_history'])
+            )
+        remaining = deadline - time.monotonic()
+        resume_results = self.submit_batch("/v1/chat/completions", resume_bodies, remaining) if resume_bodies and remaining > 0 else {}
+        
+        for i in pending:
+            body = resume_results.get(f"resume-{i}")
+            if body is None:
+                continue
+            try:
+                resume_data = ResumeData.model_validate_json(body["choices"][0]["message"]["content"])
+            except (ValidationError, KeyError, IndexError, TypeError):
+                continue
+            _dedupe_starting_verbs(resume_data)
+            _RESUME_CACHE.put(cache_keys[i], resume_data)
+            resumes[i] = self._finalize_resume(resume_data, jobs[i][1])
+        
+        # Jobs the batch did not finish go through the online API
+        missing = [i for i, resume in enumerate(resumes) if resume is None]
+        if missing:
+            online = _run_sync(self._agenerate_many([jobs[i] for i in missing]))
+            for i, resume in zip(missing, online):
+                resumes[i] = resume
+        return resumes
+
     def _generate_summary_with_ai(self, job_description, experiences):
         """Generate a summary using OpenAI based on job description and experiences."""
+        return _run_sync(self._agenerate_summary_with_ai(job_description, experiences))
+
+    async def _agenerate_summary_with_ai(self, job_description, experiences):
+        """Async variant of _generate_summary_with_ai, so the summary call can be gathered with other requests."""
         try:
             # Extract experience details to provide to the AI
             experience_details = []
             for exp in experiences:
-                bullet_points = [bp.bullet_point for bp in exp.bullet_points]
                 experience_details.append({
                     "company": exp.company_info.name,
                     "job_title": exp.job_title,
                     "period": exp.company_info.period,
-                    "bullet_points": bullet_points
+                    "bullet_points": exp.bullet_points
                 })
             
             # Create a prompt for the AI
@@ -778,13 +1620,18 @@ Before outputting, perform a final self-critique. The resume is only complete if
             """
             
             # Get completion from OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume writer specializing in ATS-optimized professional summaries."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200
+            messages = [
+                {"role": "system", "content": "You are an expert resume writer specializing in ATS-optimized professional summaries."},
+                {"role": "user", "content": prompt}
+            ]
+            response = await self.runner.call(
+                lambda: self.aclient.chat.completions.create(
+                    model="gpt-4o",
+                    messages=messages,
+                    max_tokens=200
+                ),
+                [message["content"] for message in messages],
+                max_output_tokens=200
             )
             
             # Extract and return the summary
@@ -797,46 +1644,37 @@ Before outputting, perform a final self-critique. The resume is only complete if
     
     def _extract_keywords(self, job_description: str) -> List[str]:
         """Extract important keywords from job description."""
-        # Remove common words and focus on technical terms
-        common_words = {"the", "and", "a", "to", "of", "in", "with", "for", "on", "is", "are", "you", "will", "be"}
-        
-        # Split into words, convert to lowercase, remove common words and short words
-        words = re.findall(r'\b[a-zA-Z]+\b', job_description.lower())
-        keywords = [word for word in words if word not in common_words and len(word) > 3]
-        
-        # Count frequencies and return top keywords
-        keyword_freq = {}
-        for word in keywords:
-            keyword_freq[word] = keyword_freq.get(word, 0) + 1
-            
-        # Sort by frequency and return top 15
-        sorted_keywords = sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, _ in sorted_keywords[:min(15, len(sorted_keywords))]]
+        return list(_extract_keywords_cached(job_description))
     
-    def _generate_summary(self, job_description: str, keywords: List[str]) -> str:
+    def _generate_summary(self, job_description: str, keywords: List[str], experience_data: Optional[str] = None) -> str:
         """Generate a tailored summary based on experience and job keywords."""
+        if experience_data is None:
+            experience_data = self.experience_data
+        
         # Find relevant parts of experience that match keywords
         relevant_experience = []
         
-        # Process experience data to find sections matching keywords
-        sections = re.split(r'\n#{2,3} ', self.experience_data)
-        
-        for section in sections:
-            keyword_count = sum(1 for keyword in keywords if keyword in section.lower())
+        # Score each section by how many keywords occur in it as words, intersecting in C
+        # against the section's precomputed word set
+        section_words, first_paragraphs = _experience_sections(experience_data)
+        keyword_set = frozenset(keywords)
+        for index, words in enumerate(section_words):
+            keyword_count = len(keyword_set & words)
             if keyword_count > 0:
-                relevant_experience.append((section, keyword_count))
+                relevant_experience.append((index, keyword_count))
         
-        # Sort by relevance (keyword count)
-        relevant_experience.sort(key=lambda x: x[1], reverse=True)
+        # Use the top 3 most relevant sections (by keyword count; ties keep document order)
+        # without sorting the rest
+        top_sections = heapq.nlargest(3, relevant_experience, key=lambda x: x[1])
         
         # Construct summary from most relevant experience sections
         summary_parts = []
         total_length = 0
         max_length = 1500  # Maximum character length for summary
         
-        for section, _ in relevant_experience[:3]:  # Use top 3 most relevant sections
-            # Extract just the first paragraph from each section
-            first_para = section.split('\n\n')[0].strip()
+        for index, _ in top_sections:
+            # Use just the first paragraph from each section
+            first_para = first_paragraphs[index]
             if total_length + len(first_para) <= max_length:
                 summary_parts.append(first_para)
                 total_length += len(first_para)
@@ -850,64 +1688,17 @@ Before outputting, perform a final self-critique. The resume is only complete if
             
         return summary 
 
-    def _legacy_generate_tailored_resume(self, job_description: str, user_info: Dict[str, str]) -> ResumeData:
+    def _legacy_generate_tailored_resume(self, job_description: str, user_info: Dict[str, str], experience_data: Optional[str] = None, keywords: Optional[List[str]] = None) -> ResumeData:
         """Legacy method to generate resume without using LLM (as fallback)."""
-        # Extract keywords from job description
-        keywords = self._extract_keywords(job_description)
+        # Extract keywords from job description unless already computed
+        if keywords is None:
+            keywords = self._extract_keywords(job_description)
         
         # Generate tailored summary based on job description and experience
-        summary = self._generate_summary(job_description, keywords)
-        
-        # Generate placeholder experiences for three companies
-        experiences = [
-            Experience(
-                company_info=CompanyInfo(
-                    name="Tech Innovators Inc.",
-                    period="01/2021 - 05/2025",
-                    location="New York, NY"
-                ),
-                job_title="Senior AI Engineer",
-                bullet_points=[
-                    BulletPoint(bullet_point="Engineered a supervisor-orchestrated multi-agent system on Azure, leveraging LangGraph's stateful execution capabilities, reducing data engineering development time by 40%."),
-                    BulletPoint(bullet_point="Fused agent systems with Azure OpenAI Service for sophisticated natural language understanding, enabling automated translation of Jira issues into optimized data pipeline code."),
-                    BulletPoint(bullet_point="Implemented multi-stage code validation within the LangGraph framework, incorporating unit tests and integration tests, reducing manual code review overhead by 70%."),
-                    BulletPoint(bullet_point="Enhanced contextual awareness by creating GraphRAG systems using Neo4j integrated with Azure AI Search, resulting in an 18% improvement in code generation accuracy."),
-                    BulletPoint(bullet_point="Defined and codified reusable domain-specific process definition libraries (PDLs) for rapid instantiation of pre-configured, industry-tailored agent workflows.")
-                ]
-            ),
-            Experience(
-                company_info=CompanyInfo(
-                    name="Intelligent Solutions Group",
-                    period="06/2018 - 12/2020",
-                    location="San Francisco, CA"
-                ),
-                job_title="Technology Architecture Lead",
-                bullet_points=[
-                    BulletPoint(bullet_point="Led architectural design and development of complex multi-agent AI systems using CrewAI and LangChain, enabling autonomous decision-making, resulting in 25% improvement in first-call resolution rates."),
-                    BulletPoint(bullet_point="Designed and implemented agent communication protocols using gRPC and RabbitMQ, ensuring robust and scalable inter-agent communication within customer service platforms."),
-                    BulletPoint(bullet_point="Developed belief-desire-intention (BDI) agent architectures within the CrewAI framework, optimizing for rapid response times and accurate information retrieval."),
-                    BulletPoint(bullet_point="Orchestrated deployment of agentic AI solutions on Microsoft Azure using Kubernetes and AKS, ensuring scalability and fault tolerance."),
-                    BulletPoint(bullet_point="Provided technical leadership to a team of 9 AI engineers, fostering expertise in agent-based modeling and multi-agent system design.")
-                ]
-            ),
-            Experience(
-                company_info=CompanyInfo(
-                    name="Communication Systems Inc.",
-                    period="01/2016 - 05/2018",
-                    location="Boston, MA"
-                ),
-                job_title="Python Developer",
-                bullet_points=[
-                    BulletPoint(bullet_point="Developed robust backend systems using Python and Flask framework to automate configuration and management of contact center deployments, streamlining setup processes."),
-                    BulletPoint(bullet_point="Integrated systems with programmable communications APIs via RESTful interfaces, enabling programmatic control over contact center features and workflows."),
-                    BulletPoint(bullet_point="Implemented core automation logic using Python, leveraging requests library for API interaction and SQLAlchemy for database operations."),
-                    BulletPoint(bullet_point="Designed and implemented message queue-based task management systems using RabbitMQ and pika, enabling asynchronous processing of configuration tasks."),
-                    BulletPoint(bullet_point="Created comprehensive testing suites using pytest, achieving 92% code coverage and reducing production incidents by 35%.")
-                ]
-            )
-        ]
+        summary = self._generate_summary(job_description, keywords, experience_data)
         
-        return ResumeData(
+        # Deep copies: CompanyInfo is mutable, so callers must not share the placeholders
+        return ResumeData.model_construct(
             name=user_info.get("name", ""),
             title=user_info.get("title", ""),
             email=user_info.get("email", ""),
@@ -915,7 +1706,7 @@ Before outputting, perform a final self-critique. The resume is only complete if
             location=user_info.get("location", ""),
             linkedin=user_info.get("linkedin"),
             summary=summary,
-            experiences=experiences,
+            experiences=[exp.model_copy(deep=True) for exp in _FALLBACK_EXPERIENCES],
             education=[],
             employment_history=[],
             skills=[]